@@ -6,6 +6,7 @@ import sqlite3
 import pandas as pd
 from pathlib import Path
 import os
+from collections import Counter
 from urllib.parse import quote as url_quote
 import re
 from datetime import datetime
@@ -762,10 +763,7 @@ def main():
         st.markdown('<div class="section-header">Summary</div>', unsafe_allow_html=True)
         
         # Frame breakdown
-        frame_counts = {}
-        for row in results:
-            frame = row[5]  # frame is the 6th column (0-indexed)
-            frame_counts[frame] = frame_counts.get(frame, 0) + 1
+        frame_counts = Counter(row[5] for row in results)  # frame is the 6th column (0-indexed)
         
         st.markdown('<div class="summary-grid">', unsafe_allow_html=True)
         
@@ -782,10 +780,7 @@ def main():
         
         with col_y:
             if len(selected_years) > 1:
-                year_counts = {}
-                for row in results:
-                    year = row[1]  # year is the 2nd column (0-indexed)
-                    year_counts[year] = year_counts.get(year, 0) + 1
+                year_counts = Counter(row[1] for row in results)  # year is the 2nd column (0-indexed)
                 
                 st.markdown('<div class="summary-card">', unsafe_allow_html=True)
                 st.markdown('<h4>Year Distribution</h4>', unsafe_allow_html=True)
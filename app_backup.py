@@ -6,6 +6,8 @@ import sqlite3
 import pandas as pd
 from pathlib import Path
 import os
+from collections import Counter
+import re
 
 # Import our modules
 from enhanced_historian import EvidenceBasedHistorian
@@ -116,6 +118,39 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# URL-based debate context, used when no debate title is stored
+_URL_CLS = re.compile(r"(aliens|unemployment|labour)", re.IGNORECASE)
+_URL_CONTEXT = {
+    "aliens": "Aliens Act Debate - ",
+    "unemployment": "Unemployment Debate - ",
+    "labour": "Labour Debate - ",
+}
+
+def url_debate_context(url):
+    """Classify a Hansard URL with a single precompiled regex pass"""
+    found = {m.lower() for m in _URL_CLS.findall(url or "")}
+    # Dict order keeps the original aliens > unemployment > labour priority
+    return next((ctx for key, ctx in _URL_CONTEXT.items() if key in found), "")
+
+# Only quotes at or above this confidence are ever displayed
+MIN_CONFIDENCE = 5
+
+def ensure_indexes(conn):
+    """One-time migration: partial index over the high-confidence subset"""
+    try:
+        # Predicate must match the literal used in main() for the planner to pick it
+        conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_quotes_hiqual
+            ON quotes(year, frame, confidence)
+            WHERE confidence >= {MIN_CONFIDENCE}
+        """)
+        conn.execute("ANALYZE quotes")
+        conn.commit()
+    except sqlite3.Error:
+        # Read-only deployments still work, just without the index
+        pass
+    return conn
+
 @st.cache_resource
 def get_database():
     """Get database connection with pithy Claude AI analysis"""
@@ -123,23 +158,37 @@ def get_database():
     db_path = "database_neutral.db"
     
     if Path(db_path).exists():
-        return sqlite3.connect(db_path, check_same_thread=False)
+        return ensure_indexes(sqlite3.connect(db_path, check_same_thread=False))
     
     # Fallback to verbose version
     fallback_path = "database_updated.db"
     if Path(fallback_path).exists():
         st.warning("Using verbose analysis database - may contain lengthy descriptions")
-        return sqlite3.connect(fallback_path, check_same_thread=False)
+        return ensure_indexes(sqlite3.connect(fallback_path, check_same_thread=False))
     
     # Final fallback
     original_path = "hansard_simple.db"
     if Path(original_path).exists():
         st.warning("Using original database - Claude AI analysis may not be available")
-        return sqlite3.connect(original_path, check_same_thread=False)
+        return ensure_indexes(sqlite3.connect(original_path, check_same_thread=False))
     
     st.error("Database not found. Please contact the administrator.")
     st.stop()
 
+@st.cache_resource
+def get_historian():
+    """Process-wide historian instance, shared across sessions like get_database()"""
+    return EvidenceBasedHistorian()
+
+@st.cache_resource
+def schema_columns() -> frozenset:
+    """Column names of the quotes table, probed once per process"""
+    try:
+        db_columns = get_database().execute("PRAGMA table_info(quotes)").fetchall()
+        return frozenset(col[1] for col in db_columns)
+    except sqlite3.Error:
+        return frozenset()
+
 def main():
     st.title("Hansard Quote Explorer (1900-1930)")
     st.markdown("*Immigration × Labour Market Debates in UK Parliament*")
@@ -210,7 +259,7 @@ def main():
         selected_frames = [frame_mapping[rf] for rf in selected_readable_frames]
     
     # Initialize historian
-    historian = EvidenceBasedHistorian()
+    historian = get_historian()
     
     # Build query with confidence filter
     where_conditions = []
@@ -232,50 +281,50 @@ def main():
         params.extend(selected_frames)
     
     # Quality filter - only show high confidence quotes
-    min_confidence = 5
-    where_conditions.append("confidence >= ?")
-    params.append(min_confidence)
-    
-    # Execute query - check if verified_speaker column exists
-    try:
-        # Try to get column info to see what columns exist
-        db_columns = db.execute("PRAGMA table_info(quotes)").fetchall()
-        column_names = [col[1] for col in db_columns]
-        
-        # Build query based on available columns
-        base_columns = "id, year, date, speaker, party, frame, quote, hansard_url, historian_analysis, confidence"
-        optional_columns = []
-        
-        if 'corrected_speaker' in column_names:
-            optional_columns.append('corrected_speaker')
-        if 'enhanced_speaker' in column_names:
-            optional_columns.append('enhanced_speaker')
-        if 'debate_title' in column_names:
-            optional_columns.append('debate_title')
-        if 'verified_speaker' in column_names:
-            optional_columns.append('verified_speaker')
-        
-        if optional_columns:
-            query = f"SELECT {base_columns}, {', '.join(optional_columns)} FROM quotes"
-        else:
-            query = f"SELECT {base_columns} FROM quotes"
-            
-    except Exception as e:
-        # Fallback to basic query if column check fails
-        query = "SELECT id, year, date, speaker, party, frame, quote, hansard_url, historian_analysis, confidence FROM quotes"
+    # Inlined as a literal (not a bound parameter) so idx_quotes_hiqual applies
+    where_conditions.append(f"confidence >= {MIN_CONFIDENCE}")
+    
+    # Build query based on available columns (schema is probed once per process)
+    schema = schema_columns()
+    base_columns = "id, year, date, speaker, party, frame, quote, hansard_url, historian_analysis, confidence"
+    optional_columns = [
+        col for col in ('corrected_speaker', 'enhanced_speaker', 'debate_title', 'verified_speaker')
+        if col in schema
+    ]
+    
+    if optional_columns:
+        query = f"SELECT {base_columns}, {', '.join(optional_columns)} FROM quotes"
+    else:
+        query = f"SELECT {base_columns} FROM quotes"
     
     if where_conditions:
         query += " WHERE " + " AND ".join(where_conditions)
     
     query += f" ORDER BY {sort_options[selected_sort]}"
     
-    results = db.execute(query, params).fetchall()
+    cursor = db.execute(query, params)
+    results = cursor.fetchall()
+    # Object columns hold the sqlite3 values as-is (NULLs stay None) for the
+    # column-wise speaker coalescing below
+    results_df = pd.DataFrame(results, columns=[col[0] for col in cursor.description], dtype=object)
+    
+    # Best available speaker per row - verified speaker has highest priority
+    best_speaker = pd.Series(None, index=results_df.index, dtype=object)
+    for col in ('verified_speaker', 'corrected_speaker', 'enhanced_speaker', 'speaker'):
+        if col in results_df.columns:
+            # Treat empty strings like NULLs, matching the old `or` chain
+            best_speaker = best_speaker.combine_first(results_df[col].mask(results_df[col] == ""))
+    best_speakers = best_speaker.tolist()
     
     # Results info
     total_in_db = db.execute("SELECT COUNT(*) FROM quotes").fetchone()[0]
     st.write(f"**{len(results)} high-quality quotes found** (from {total_in_db} total in database)")
     
     if results:
+        # Resolve all missing analyses up front in one batch
+        missing_ids = [row[0] for row in results if not row[8]]
+        fallback_analyses = historian.analyze_quotes(missing_ids) if missing_ids else {}
+        
         # Display results
         for i, row in enumerate(results):
             # Handle variable number of columns based on what's available
@@ -287,8 +336,8 @@ def main():
             debate_title = row[12] if len(row) > 12 else None
             verified_speaker = row[13] if len(row) > 13 else None
             
-            # Use best available speaker name - verified speaker has highest priority
-            speaker = verified_speaker or corrected_speaker or enhanced_speaker or original_speaker
+            # Use best available speaker name (coalesced column-wise above)
+            speaker = best_speakers[i]
             # Make frame readable
             readable_frame = frame.replace('_', ' ').title()
             
@@ -297,13 +346,7 @@ def main():
                 debate_context = f"{debate_title} - "
             else:
                 # Fallback to URL-based extraction
-                debate_context = ""
-                if 'aliens' in url.lower():
-                    debate_context = "Aliens Act Debate - "
-                elif 'unemployment' in url.lower():
-                    debate_context = "Unemployment Debate - "
-                elif 'labour' in url.lower():
-                    debate_context = "Labour Debate - "
+                debate_context = url_debate_context(url)
             
             # Convert date to British format (DD/MM/YYYY)
             try:
@@ -337,14 +380,8 @@ def main():
             clean_title = clean_debate_title(debate_title) if debate_title else ""
             if clean_title:
                 debate_context = f"{clean_title} - "
-            elif 'aliens' in url.lower():
-                debate_context = "Aliens Act Debate - "
-            elif 'unemployment' in url.lower():
-                debate_context = "Unemployment Debate - "
-            elif 'labour' in url.lower():
-                debate_context = "Labour Debate - "
             else:
-                debate_context = ""
+                debate_context = url_debate_context(url)
             
             # Create clean readable header (no frame)
             party_info = f" ({party})" if party else ""
@@ -354,7 +391,7 @@ def main():
                 
                 # Historian Analysis
                 if not analysis:
-                    analysis = historian.analyze_quote(quote_id)
+                    analysis = fallback_analyses.get(quote_id)
                 
                 if analysis:
                     st.markdown(f"**Analysis:** *{analysis}*")
@@ -385,10 +422,7 @@ def main():
         st.subheader("Summary")
         
         # Frame breakdown
-        frame_counts = {}
-        for row in results:
-            frame = row[5]  # frame is the 6th column (0-indexed)
-            frame_counts[frame] = frame_counts.get(frame, 0) + 1
+        frame_counts = Counter(results_df['frame'])
         
         col_x, col_y = st.columns(2)
         
@@ -401,10 +435,7 @@ def main():
         
         with col_y:
             if len(selected_years) > 1:
-                year_counts = {}
-                for row in results:
-                    year = row[1]  # year is the 2nd column (0-indexed)
-                    year_counts[year] = year_counts.get(year, 0) + 1
+                year_counts = Counter(results_df['year'])
                 
                 st.write("**Year Distribution:**")
                 for year, count in sorted(year_counts.items()):
@@ -417,7 +448,7 @@ def main():
         if results:
             # Create base columns that always exist
             base_data = []
-            for row in results:
+            for i, row in enumerate(results):
                 # Extract the data we processed above
                 quote_id, year, date, original_speaker, party, frame, quote, url, analysis, confidence = row[:10]
                 
@@ -428,7 +459,7 @@ def main():
                 verified_speaker = row[13] if len(row) > 13 else None
                 
                 # Use best available speaker
-                final_speaker = verified_speaker or corrected_speaker or enhanced_speaker or original_speaker
+                final_speaker = best_speakers[i]
                 
                 base_data.append([year, date, final_speaker, party, frame, quote, url, analysis, debate_title or ""])
             
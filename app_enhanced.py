@@ -8,7 +8,10 @@ from pathlib import Path
 import os
 from urllib.parse import quote
 import re
+import json
 from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
 
 # Import our modules
 from enhanced_historian import EvidenceBasedHistorian
@@ -22,49 +25,23 @@ st.set_page_config(
 )
 
 # Modern Typography and Styling
+# The stylesheet lives in static/ (served via server.enableStaticServing) so each
+# rerun sends a one-line @import instead of the full CSS blob; the browser caches it.
 FONT_CSS = """
 <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&display=swap" rel="stylesheet">
-<style>
-:root{
-  --bg:#ffffff; --text:#111827; --muted:#6B7280; --soft:#F3F4F6; --line:#E5E7EB; --radius:16px;
-}
-html, body, [class*="css"] { font-family:'Inter', system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial; letter-spacing:.01em; }
-h1,h2,h3 { letter-spacing:-.01em; }
-.small{ color:var(--muted); font-size:.875rem; }
-
-.header-wrap{ display:flex; align-items:center; justify-content:space-between; gap:12px; padding:8px 0 24px; border-bottom:1px solid var(--line); margin-bottom:24px; }
-.badge{ display:inline-flex; gap:8px; align-items:center; padding:6px 10px; border-radius:999px; background:var(--soft); color:var(--muted); font-size:12px; }
-
-.card{ border:1px solid var(--line); border-radius:var(--radius); background:var(--bg); padding:18px; transition:120ms ease; }
-.card:hover{ box-shadow:0 6px 18px rgba(17,24,39,.06); transform:translateY(-1px); }
-
-.btn-link{ display:inline-flex; align-items:center; gap:8px; padding:10px 12px; border-radius:12px; border:1px solid var(--line); background:#fff; text-decoration:none; color:var(--text); }
-.btn-link:hover{ background:var(--soft); }
-.link-row{ display:flex; flex-wrap:wrap; gap:10px; }
-
-.input-block{ border:1px solid var(--line); border-radius:var(--radius); padding:18px; background:var(--bg); }
-.kbd{ font-family:ui-monospace,SFMono-Regular,Menlo,monospace; background:var(--soft); padding:2px 6px; border-radius:6px; border:1px solid var(--line); }
-hr{ border:none; border-top:1px solid var(--line); margin:18px 0; }
-
-/* Streamlit specific overrides */
-.stExpander { border: 1px solid var(--line) !important; border-radius: var(--radius) !important; }
-.stExpander > div > div { padding: 18px !important; }
-.stSelectbox > div > div { border-radius: 12px !important; }
-.stMultiSelect > div > div { border-radius: 12px !important; }
-</style>
+<style>@import url('app/static/app_enhanced.css');</style>
 """
 st.markdown(FONT_CSS, unsafe_allow_html=True)
 
 # Text Fragment Deep Linking Helpers
-SMARTS = {"'":"'", "'":"'", """:'"', """:'"', "—":"-", "–":"-", "\u00A0":" "}
+SMARTS = {"\u2018":"'", "\u2019":"'", "\u201C":'"', "\u201D":'"', "—":"-", "–":"-", "\u00A0":" "}
+_SMARTS_TABLE = str.maketrans(SMARTS)
+_WS_RE = re.compile(r"\s+")
 
 def normalize_text(s: str) -> str:
     """Normalize text for better URL fragment matching"""
     if not s: return s
-    for k, v in SMARTS.items():
-        s = s.replace(k, v)
-    return re.sub(r"\s+", " ", s).strip()
+    return _WS_RE.sub(" ", s.translate(_SMARTS_TABLE)).strip()
 
 def text_fragment_url(base_url: str, exact: str, prefix: str = "", suffix: str = "") -> str:
     """
@@ -90,8 +67,33 @@ def make_hansard_link(url: str, quote: str, prefix: str = "", suffix: str = "")
     """Public helper to create deep-linked Hansard URLs"""
     # Use first 100 chars of quote for better matching
     quote_excerpt = quote[:100].strip() if quote else ""
+    return _cached_fragment_url(url, quote_excerpt, prefix, suffix)
+
+@lru_cache(maxsize=2048)
+def _cached_fragment_url(url: str, quote_excerpt: str, prefix: str, suffix: str) -> str:
+    # Each quote is linked twice per rerun (card + CSV), keyed on the excerpt only
     return text_fragment_url(url, quote_excerpt, prefix, suffix)
 
+def prepare_database(conn):
+    """Connection tuning plus one-time indexes for the filter/sort queries"""
+    # Name-based row access everywhere instead of positional tuples
+    conn.row_factory = sqlite3.Row
+    # Keep the whole (small) database in the page cache
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Filter on confidence/year/frame; date lets the planner skip the sort
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_quotes_filter ON quotes(confidence, year, frame, date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_quotes_sort_conf ON quotes(confidence DESC, year, date)")
+        conn.execute("ANALYZE")
+        conn.commit()
+    except sqlite3.Error:
+        # Read-only deployments still work, just without the indexes
+        pass
+    return conn
+
 @st.cache_resource
 def get_database():
     """Get database connection with pithy Claude AI analysis"""
@@ -99,38 +101,352 @@ def get_database():
     db_path = "database_neutral.db"
     
     if Path(db_path).exists():
-        return sqlite3.connect(db_path, check_same_thread=False)
+        return prepare_database(sqlite3.connect(db_path, check_same_thread=False))
     
     # Fallback to verbose version
     fallback_path = "database_updated.db"
     if Path(fallback_path).exists():
         st.warning("Using verbose analysis database - may contain lengthy descriptions")
-        return sqlite3.connect(fallback_path, check_same_thread=False)
+        return prepare_database(sqlite3.connect(fallback_path, check_same_thread=False))
     
     # Final fallback
     original_path = "hansard_simple.db"
     if Path(original_path).exists():
         st.warning("Using original database - Claude AI analysis may not be available")
-        return sqlite3.connect(original_path, check_same_thread=False)
+        return prepare_database(sqlite3.connect(original_path, check_same_thread=False))
     
     st.error("Database not found. Please contact the administrator.")
     st.stop()
 
-def main():
-    # Modern Header
-    st.markdown(
-        f"""
+# Columns every quotes table has; optional ones are appended when present
+BASE_COLUMNS = "id, year, date, speaker, party, frame, quote, hansard_url, historian_analysis, confidence"
+OPTIONAL_COLUMNS = ('corrected_speaker', 'enhanced_speaker', 'debate_title', 'verified_speaker')
+
+@st.cache_resource
+def get_schema(_db) -> frozenset:
+    """Column names of the quotes table, probed once per process"""
+    try:
+        return frozenset(r['name'] for r in _db.execute("PRAGMA table_info(quotes)"))
+    except sqlite3.Error:
+        return frozenset()
+
+@st.cache_resource
+def select_clause() -> str:
+    """SELECT ... FROM quotes for the columns this database actually has"""
+    schema = get_schema(get_database())
+    optional_columns = [col for col in OPTIONAL_COLUMNS if col in schema]
+    if optional_columns:
+        return f"SELECT {BASE_COLUMNS}, {', '.join(optional_columns)} FROM quotes"
+    return f"SELECT {BASE_COLUMNS} FROM quotes"
+
+# Sort label -> ORDER BY clause (whitelist; never interpolate user input)
+SORT_OPTIONS = {
+    "Chronological (Oldest First)": "year, date, confidence DESC",
+    "Highest Quality First": "confidence DESC, year, date"
+}
+
+# Only quotes at or above this confidence are displayed
+MIN_CONFIDENCE = 5
+
+# Constant SQL text, so sqlite3's per-connection statement cache reuses the plan.
+# Frames travel as one JSON array; NULL means no frame filter.
+WHERE_SQL = """
+ WHERE year BETWEEN :year_from AND :year_to
+   AND (:frames IS NULL OR frame IN (SELECT value FROM json_each(:frames)))
+   AND confidence >= :min_confidence"""
+
+def where_clause(years: tuple, frames: tuple):
+    """WHERE clause and parameters shared by the result and summary queries"""
+    # Year selection is always a contiguous range from the slider
+    return WHERE_SQL, {
+        "year_from": min(years),
+        "year_to": max(years),
+        "frames": json.dumps(list(frames)) if frames else None,
+        "min_confidence": MIN_CONFIDENCE,
+    }
+
+@st.cache_data(ttl=600)
+def load_quotes(years: tuple, frames: tuple, sort_key: str) -> pd.DataFrame:
+    """Filtered high-confidence quotes, memoized per (years, frames, sort) key"""
+    where_sql, params = where_clause(years, frames)
+    query = select_clause() + where_sql + f" ORDER BY {SORT_OPTIONS[sort_key]}"
+    
+    df = pd.read_sql_query(query, get_database(), params=params)
+    # NULLs back to None so truthiness checks behave like sqlite3 rows
+    return df.astype(object).where(df.notna(), None)
+
+@st.cache_data(ttl=600)
+def load_summary(years: tuple, frames: tuple):
+    """Frame and year distributions for the filter, aggregated in SQL"""
+    db = get_database()
+    where_sql, params = where_clause(years, frames)
+    frame_counts = {r['frame']: r['n'] for r in db.execute(
+        f"SELECT frame, COUNT(*) AS n FROM quotes{where_sql} GROUP BY frame ORDER BY frame", params
+    )}
+    year_counts = {r['year']: r['n'] for r in db.execute(
+        f"SELECT year, COUNT(*) AS n FROM quotes{where_sql} GROUP BY year ORDER BY year", params
+    )}
+    return frame_counts, year_counts
+
+def request_analysis(historian, quote_id: int):
+    """Button callback: generate (and persist) a card's missing analysis.
+
+    Only a successful result is kept for later reruns; after a failure the
+    card shows the button again, so the next click retries.
+    """
+    analysis = historian.analyze_quote(quote_id)
+    if analysis:
+        st.session_state[f"analysis_{quote_id}"] = analysis
+    else:
+        st.session_state[f"analysis_failed_{quote_id}"] = True
+
+# Quote cards rendered per page when details are shown
+PAGE_SIZE = 50
+
+# URL-based debate context, used when no debate title is stored.
+# Alternatives are tried in order, so aliens > unemployment > labour.
+_URL_CAT_RE = re.compile(r"^(?:.*(aliens)|.*(unemployment)|.*(labour))", re.IGNORECASE)
+_URL_CONTEXT = {
+    "aliens": "Aliens Act Debate - ",
+    "unemployment": "Unemployment Debate - ",
+    "labour": "Labour Debate - ",
+}
+
+@lru_cache(maxsize=1024)
+def clean_debate_title(title):
+    """Clean up debate title for header"""
+    if not title:
+        return ""
+    # Remove trailing periods and extra spaces
+    title = title.strip().rstrip('.')
+    # Take first part before em dash or regular dash
+    if '—' in title:
+        title = title.split('—')[0].strip()
+    elif ' - ' in title and len(title) > 40:
+        title = title.split(' - ')[0].strip()
+    # Limit length and clean up
+    if len(title) > 35:
+        title = title[:32] + "..."
+    return title
+
+def prepare_display(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the derived display columns used by the table, cards and export"""
+    view = df.copy()
+    
+    # Use best available speaker name - verified speaker has highest priority
+    speaker = pd.Series(None, index=view.index, dtype=object)
+    for col in ('verified_speaker', 'corrected_speaker', 'enhanced_speaker', 'speaker'):
+        if col in view.columns:
+            # Treat empty strings like NULLs, matching the old `or` chain
+            speaker = speaker.combine_first(view[col].mask(view[col] == ""))
+    view['display_speaker'] = speaker
+    
+    # Make frame readable
+    view['readable_frame'] = view['frame'].str.replace('_', ' ').str.title()
+    
+    # Convert date to British format (DD/MM/YYYY); anything not YYYY-MM-DD is kept as stored
+    parsed = pd.to_datetime(view['date'], format='%Y-%m-%d', errors='coerce')
+    view['british_date'] = parsed.dt.strftime('%d/%m/%Y').astype(object).where(parsed.notna(), view['date'])
+    
+    # Cleaned debate title if available, otherwise URL-based context
+    if 'debate_title' in view.columns:
+        view['clean_title'] = view['debate_title'].map(clean_debate_title, na_action='ignore').fillna("")
+    else:
+        view['clean_title'] = ""
+    url_key = view['hansard_url'].str.extract(_URL_CAT_RE).bfill(axis=1)[0].str.lower()
+    url_context = url_key.map(_URL_CONTEXT).fillna("")
+    view['debate_context'] = (view['clean_title'] + " - ").where(view['clean_title'] != "", url_context)
+    view['deep_link'] = [make_hansard_link(u, q) for u, q in zip(view['hansard_url'], view['quote'])]
+    return view
+
+@st.cache_data(ttl=600)
+def build_csv(years: tuple, frames: tuple, sort_key: str) -> bytes:
+    """CSV export for a filter key, written chunkwise and memoized as bytes"""
+    view = prepare_display(load_quotes(years, frames, sort_key))
+    
+    # Use best available speaker; deep links come from the same memoized helper as the cards
+    df = pd.DataFrame({
+        'Year': view['year'],
+        'Date': view['date'],
+        'Speaker': view['display_speaker'],
+        'Party': view['party'],
+        'Frame': view['frame'],
+        'Quote': view['quote'],
+        'Hansard_URL': view['hansard_url'],
+        'Deep_Link_URL': view['deep_link'],
+        'Analysis': view['historian_analysis'],
+        'Debate_Title': view['debate_title'].fillna("") if 'debate_title' in view.columns else "",
+    })
+    
+    buf = BytesIO()
+    df.to_csv(buf, index=False, chunksize=1000, encoding='utf-8')
+    return buf.getvalue()
+
+HEADER_HTML = """
         <div class="header-wrap">
           <div>
             <div class="badge">Hansard Quotes</div>
             <h1 style="margin:6px 0 0 0;">Make quotes easy to find.</h1>
             <div class="small">Clean UI. Links that open at the exact quote.</div>
           </div>
-          <div class="small" style="color:#6B7280;">{datetime.now().strftime('%b %d, %Y')}</div>
+          <div class="small" style="color:#6B7280;">{today}</div>
         </div>
-        """,
-        unsafe_allow_html=True
-    )
+        """
+
+@st.cache_data(ttl=3600)
+def today_str() -> str:
+    """Header date, refreshed hourly rather than on every rerun"""
+    return datetime.now().strftime('%b %d, %Y')
+
+# Scoped reruns: widgets inside a fragment only rerun that fragment (st.fragment
+# landed in 1.37, experimental_fragment in 1.33); older Streamlit reruns the page.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+@fragment
+def deep_link_tester():
+    """Deep link tester; typing here no longer reruns the query or the results"""
+    # Optional: Deep Link Tester
+    with st.expander("🔗 Build a deep link (tester)"):
+        st.markdown('<div class="input-block">', unsafe_allow_html=True)
+        _url = st.text_input("Hansard debate URL", key="dl_url")
+        _q = st.text_area("Exact quote (tight excerpt is best)", key="dl_q", height=100)
+        c1, c2 = st.columns(2)
+        with c1: _pre = st.text_input("Prefix (optional)", key="dl_pre")
+        with c2: _suf = st.text_input("Suffix (optional)", key="dl_suf")
+        if st.button("Generate link", key="dl_btn", use_container_width=True, type="primary"):
+            _link = make_hansard_link(_url, _q, _pre, _suf)
+            if _link:
+                st.markdown(
+                    f"""
+                    <div class="card">
+                      <div class="link-row">
+                        <a class="btn-link" href="{_link}" target="_blank" rel="noopener">Open link ↗</a>
+                      </div>
+                      <hr/>
+                      <div style="word-break:break-all; font-family:monospace; font-size:12px;">{_link}</div>
+                    </div>
+                    """, unsafe_allow_html=True
+                )
+            else:
+                st.caption("Enter a URL and a quote to generate a link.")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+@fragment
+def render_results(years: tuple, frames: tuple, sort_key: str, historian):
+    """Results table, detail cards, summary and export for the current filters"""
+    results_df = load_quotes(years, frames, sort_key)
+    
+    # Results info
+    total_in_db = get_database().execute("SELECT COUNT(*) AS n FROM quotes").fetchone()['n']
+    st.write(f"**{len(results_df)} high-quality quotes found** (from {total_in_db} total in database)")
+    
+    if not results_df.empty:
+        # Display fields computed column-wise once for the table and the cards
+        view = prepare_display(results_df)
+        
+        # Compact list view: one widget instead of one expander per quote
+        st.dataframe(
+            pd.DataFrame({
+                "Date": view["british_date"],
+                "Debate": view["clean_title"],
+                "Speaker": view["display_speaker"],
+                "Party": view["party"],
+                "Frame": view["readable_frame"],
+                "Hansard": view["deep_link"],
+            }),
+            column_config={"Hansard": st.column_config.LinkColumn("Hansard", display_text="View ↗")},
+            hide_index=True,
+            use_container_width=True
+        )
+        
+        # Rich cards only for the current page, on request
+        if st.toggle("Show details", key="show_details"):
+            n_pages = (len(view) - 1) // PAGE_SIZE + 1
+            page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1) if n_pages > 1 else 1
+            start = (page - 1) * PAGE_SIZE
+            
+            for row in view.iloc[start:start + PAGE_SIZE].itertuples(index=False):
+                analysis = row.historian_analysis
+                
+                # Create clean readable header (no frame)
+                party_info = f" ({row.party})" if row.party else ""
+                header = f"{row.british_date}: {row.debate_context}{row.display_speaker}{party_info}"
+                
+                with st.expander(header, expanded=False):
+                    
+                    # Analysis - generated only once the user asks for it
+                    if not analysis:
+                        analysis = st.session_state.get(f"analysis_{row.id}")
+                    
+                    if analysis:
+                        st.markdown(f"**Analysis:** *{analysis}*")
+                    else:
+                        st.markdown("**Analysis:** *Analysis pending...*")
+                        if st.session_state.pop(f"analysis_failed_{row.id}", False):
+                            st.caption("Analysis could not be generated - try again.")
+                        st.button("Load analysis", key=f"load_{row.id}", on_click=request_analysis, args=(historian, row.id))
+                    
+                    # Full quote
+                    st.markdown("**Full Quote:**")
+                    st.write(row.quote)
+                    
+                    # Enhanced metadata with deep link
+                    col_a, col_b, col_c = st.columns(3)
+                    with col_a:
+                        st.write(f"**📅 Date:** {row.british_date}")
+                        st.write(f"**Year:** {row.year}")
+                    
+                    with col_b:
+                        st.write(f"**Speaker:** {row.display_speaker}")
+                        if row.party:
+                            st.write(f"**Party:** {row.party}")
+                    
+                    with col_c:
+                        st.write(f"**Frame:** {row.frame}")
+                        # Enhanced deep link
+                        st.markdown(
+                            f'<a class="btn-link" href="{row.deep_link}" target="_blank" rel="noopener">View on Hansard ↗</a>', 
+                            unsafe_allow_html=True
+                        )
+        
+        # Summary statistics
+        st.markdown("---")
+        st.subheader("Summary")
+        
+        # Frame and year breakdown (GROUP BY over the same filter)
+        frame_counts, year_counts = load_summary(years, frames)
+        
+        col_x, col_y = st.columns(2)
+        
+        with col_x:
+            st.write("**Frame Distribution:**")
+            for frame, count in frame_counts.items():
+                percentage = (count / len(results_df)) * 100
+                readable_frame = frame.replace('_', ' ').title()
+                st.write(f"• {readable_frame}: {count} ({percentage:.1f}%)")
+        
+        with col_y:
+            if len(years) > 1:
+                st.write("**Year Distribution:**")
+                for year, count in year_counts.items():
+                    st.write(f"• {year}: {count}")
+        
+        # Download option
+        st.markdown("---")
+        
+        st.download_button(
+            label="📥 Download as CSV",
+            data=build_csv(years, frames, sort_key),
+            file_name=f"hansard_quotes_{min(years)}_{max(years)}.csv",
+            mime="text/csv"
+        )
+    
+    else:
+        st.info("No high-quality quotes found matching your criteria. Try adjusting the filters.")
+
+def main():
+    # Modern Header
+    st.markdown(HEADER_HTML.format(today=today_str()), unsafe_allow_html=True)
     
     # Info box with enhanced features
     st.info("🗂️ **Academic Research Tool** | Explore 530+ parliamentary quotes on immigration and labour (1900-1930) with Claude AI analysis, verified speaker attributions, and **direct deep-links to exact quotes** in original Hansard pages | Only high-quality quotes (confidence ≥ 5) are displayed")
@@ -143,7 +459,7 @@ def main():
         st.warning("No data found in database.")
         return
     
-    available_years = [row[0] for row in years_data]
+    available_years = [row['year'] for row in years_data]
     
     # Controls
     col1, col2, col3 = st.columns(3)
@@ -166,14 +482,9 @@ def main():
     
     with col2:
         # Add sorting control
-        sort_options = {
-            "Chronological (Oldest First)": "year, date, confidence DESC",
-            "Highest Quality First": "confidence DESC, year, date"
-        }
-        
         selected_sort = st.selectbox(
             "Sort Order",
-            options=list(sort_options.keys()),
+            options=list(SORT_OPTIONS.keys()),
             index=0,
             help="Choose how to organize the quotes"
         )
@@ -181,7 +492,7 @@ def main():
     with col3:
         # Frame filter
         frames = db.execute("SELECT DISTINCT frame FROM quotes ORDER BY frame").fetchall()
-        frame_options = [row[0] for row in frames]
+        frame_options = [row['frame'] for row in frames]
         
         # Make frame options readable
         readable_frame_options = [frame.replace('_', ' ').title() for frame in frame_options]
@@ -197,275 +508,12 @@ def main():
         # Convert back to database format
         selected_frames = [frame_mapping[rf] for rf in selected_readable_frames]
     
-    # Optional: Deep Link Tester
-    with st.expander("🔗 Build a deep link (tester)"):
-        st.markdown('<div class="input-block">', unsafe_allow_html=True)
-        _url = st.text_input("Hansard debate URL", key="dl_url")
-        _q = st.text_area("Exact quote (tight excerpt is best)", key="dl_q", height=100)
-        c1, c2 = st.columns(2)
-        with c1: _pre = st.text_input("Prefix (optional)", key="dl_pre")
-        with c2: _suf = st.text_input("Suffix (optional)", key="dl_suf")
-        if st.button("Generate link", key="dl_btn", use_container_width=True, type="primary"):
-            _link = make_hansard_link(_url, _q, _pre, _suf)
-            if _link:
-                st.markdown(
-                    f"""
-                    <div class="card">
-                      <div class="link-row">
-                        <a class="btn-link" href="{_link}" target="_blank" rel="noopener">Open link ↗</a>
-                      </div>
-                      <hr/>
-                      <div style="word-break:break-all; font-family:monospace; font-size:12px;">{_link}</div>
-                    </div>
-                    """, unsafe_allow_html=True
-                )
-            else:
-                st.caption("Enter a URL and a quote to generate a link.")
-        st.markdown('</div>', unsafe_allow_html=True)
+    deep_link_tester()
     
     # Initialize historian
     historian = EvidenceBasedHistorian()
     
-    # Build query with confidence filter
-    where_conditions = []
-    params = []
-    
-    # Year filter
-    if len(selected_years) == 1:
-        where_conditions.append("year = ?")
-        params.append(selected_years[0])
-    else:
-        year_placeholders = ",".join(["?"] * len(selected_years))
-        where_conditions.append(f"year IN ({year_placeholders})")
-        params.extend(selected_years)
-    
-    # Frame filter
-    if selected_frames:
-        frame_placeholders = ",".join(["?"] * len(selected_frames))
-        where_conditions.append(f"frame IN ({frame_placeholders})")
-        params.extend(selected_frames)
-    
-    # Quality filter - only show high confidence quotes
-    min_confidence = 5
-    where_conditions.append("confidence >= ?")
-    params.append(min_confidence)
-    
-    # Execute query - check if verified_speaker column exists
-    try:
-        # Try to get column info to see what columns exist
-        db_columns = db.execute("PRAGMA table_info(quotes)").fetchall()
-        column_names = [col[1] for col in db_columns]
-        
-        # Build query based on available columns
-        base_columns = "id, year, date, speaker, party, frame, quote, hansard_url, historian_analysis, confidence"
-        optional_columns = []
-        
-        if 'corrected_speaker' in column_names:
-            optional_columns.append('corrected_speaker')
-        if 'enhanced_speaker' in column_names:
-            optional_columns.append('enhanced_speaker')
-        if 'debate_title' in column_names:
-            optional_columns.append('debate_title')
-        if 'verified_speaker' in column_names:
-            optional_columns.append('verified_speaker')
-        
-        if optional_columns:
-            query = f"SELECT {base_columns}, {', '.join(optional_columns)} FROM quotes"
-        else:
-            query = f"SELECT {base_columns} FROM quotes"
-            
-    except Exception as e:
-        # Fallback to basic query if column check fails
-        query = "SELECT id, year, date, speaker, party, frame, quote, hansard_url, historian_analysis, confidence FROM quotes"
-    
-    if where_conditions:
-        query += " WHERE " + " AND ".join(where_conditions)
-    
-    query += f" ORDER BY {sort_options[selected_sort]}"
-    
-    results = db.execute(query, params).fetchall()
-    
-    # Results info
-    total_in_db = db.execute("SELECT COUNT(*) FROM quotes").fetchone()[0]
-    st.write(f"**{len(results)} high-quality quotes found** (from {total_in_db} total in database)")
-    
-    if results:
-        # Display results with enhanced cards
-        for i, row in enumerate(results):
-            # Handle variable number of columns based on what's available
-            quote_id, year, date, original_speaker, party, frame, quote, url, analysis, confidence = row[:10]
-            
-            # Extract optional columns if they exist
-            corrected_speaker = row[10] if len(row) > 10 else None
-            enhanced_speaker = row[11] if len(row) > 11 else None
-            debate_title = row[12] if len(row) > 12 else None
-            verified_speaker = row[13] if len(row) > 13 else None
-            
-            # Use best available speaker name - verified speaker has highest priority
-            speaker = verified_speaker or corrected_speaker or enhanced_speaker or original_speaker
-            # Make frame readable
-            readable_frame = frame.replace('_', ' ').title()
-            
-            # Use extracted debate title if available, otherwise URL-based context
-            if debate_title:
-                debate_context = f"{debate_title} - "
-            else:
-                # Fallback to URL-based extraction
-                debate_context = ""
-                if 'aliens' in url.lower():
-                    debate_context = "Aliens Act Debate - "
-                elif 'unemployment' in url.lower():
-                    debate_context = "Unemployment Debate - "
-                elif 'labour' in url.lower():
-                    debate_context = "Labour Debate - "
-            
-            # Convert date to British format (DD/MM/YYYY)
-            try:
-                # Assuming date is in YYYY-MM-DD or DD/MM/YYYY format from database
-                if '-' in date and len(date.split('-')[0]) == 4:
-                    # Convert from YYYY-MM-DD to DD/MM/YYYY
-                    year_part, month, day = date.split('-')
-                    british_date = f"{day}/{month}/{year_part}"
-                else:
-                    british_date = date  # Already in correct format or different format
-            except:
-                british_date = date  # Fallback to original if parsing fails
-            
-            # Clean up debate title for header
-            def clean_debate_title(title):
-                if not title:
-                    return ""
-                # Remove trailing periods and extra spaces
-                title = title.strip().rstrip('.')
-                # Take first part before em dash or regular dash
-                if '—' in title:
-                    title = title.split('—')[0].strip()
-                elif ' - ' in title and len(title) > 40:
-                    title = title.split(' - ')[0].strip()
-                # Limit length and clean up
-                if len(title) > 35:
-                    title = title[:32] + "..."
-                return title
-            
-            # Use cleaned debate title
-            clean_title = clean_debate_title(debate_title) if debate_title else ""
-            if clean_title:
-                debate_context = f"{clean_title} - "
-            elif 'aliens' in url.lower():
-                debate_context = "Aliens Act Debate - "
-            elif 'unemployment' in url.lower():
-                debate_context = "Unemployment Debate - "
-            elif 'labour' in url.lower():
-                debate_context = "Labour Debate - "
-            else:
-                debate_context = ""
-            
-            # Create clean readable header (no frame)
-            party_info = f" ({party})" if party else ""
-            header = f"{british_date}: {debate_context}{speaker}{party_info}"
-            
-            with st.expander(header, expanded=False):
-                
-                # Analysis
-                if not analysis:
-                    analysis = historian.analyze_quote(quote_id)
-                
-                if analysis:
-                    st.markdown(f"**Analysis:** *{analysis}*")
-                else:
-                    st.markdown("**Analysis:** *Analysis pending...*")
-                
-                # Full quote
-                st.markdown("**Full Quote:**")
-                st.write(quote)
-                
-                # Enhanced metadata with deep link
-                col_a, col_b, col_c = st.columns(3)
-                with col_a:
-                    st.write(f"**📅 Date:** {british_date}")
-                    st.write(f"**Year:** {year}")
-                
-                with col_b:
-                    st.write(f"**Speaker:** {speaker}")
-                    if party:
-                        st.write(f"**Party:** {party}")
-                
-                with col_c:
-                    st.write(f"**Frame:** {frame}")
-                    # Enhanced deep link
-                    deep_link = make_hansard_link(url, quote)
-                    st.markdown(
-                        f'<a class="btn-link" href="{deep_link}" target="_blank" rel="noopener">View on Hansard ↗</a>', 
-                        unsafe_allow_html=True
-                    )
-        
-        # Summary statistics
-        st.markdown("---")
-        st.subheader("Summary")
-        
-        # Frame breakdown
-        frame_counts = {}
-        for row in results:
-            frame = row[5]  # frame is the 6th column (0-indexed)
-            frame_counts[frame] = frame_counts.get(frame, 0) + 1
-        
-        col_x, col_y = st.columns(2)
-        
-        with col_x:
-            st.write("**Frame Distribution:**")
-            for frame, count in sorted(frame_counts.items()):
-                percentage = (count / len(results)) * 100
-                readable_frame = frame.replace('_', ' ').title()
-                st.write(f"• {readable_frame}: {count} ({percentage:.1f}%)")
-        
-        with col_y:
-            if len(selected_years) > 1:
-                year_counts = {}
-                for row in results:
-                    year = row[1]  # year is the 2nd column (0-indexed)
-                    year_counts[year] = year_counts.get(year, 0) + 1
-                
-                st.write("**Year Distribution:**")
-                for year, count in sorted(year_counts.items()):
-                    st.write(f"• {year}: {count}")
-        
-        # Download option
-        st.markdown("---")
-        
-        # Prepare data for download - handle variable column counts
-        if results:
-            # Create base columns that always exist
-            base_data = []
-            for row in results:
-                # Extract the data we processed above
-                quote_id, year, date, original_speaker, party, frame, quote, url, analysis, confidence = row[:10]
-                
-                # Extract optional columns if they exist
-                corrected_speaker = row[10] if len(row) > 10 else None
-                enhanced_speaker = row[11] if len(row) > 11 else None
-                debate_title = row[12] if len(row) > 12 else None
-                verified_speaker = row[13] if len(row) > 13 else None
-                
-                # Use best available speaker
-                final_speaker = verified_speaker or corrected_speaker or enhanced_speaker or original_speaker
-                
-                # Add deep link for download
-                deep_link = make_hansard_link(url, quote)
-                
-                base_data.append([year, date, final_speaker, party, frame, quote, url, deep_link, analysis, debate_title or ""])
-            
-            df = pd.DataFrame(base_data, columns=['Year', 'Date', 'Speaker', 'Party', 'Frame', 'Quote', 'Hansard_URL', 'Deep_Link_URL', 'Analysis', 'Debate_Title'])
-        csv = df.to_csv(index=False)
-        
-        st.download_button(
-            label="📥 Download as CSV",
-            data=csv,
-            file_name=f"hansard_quotes_{min(selected_years)}_{max(selected_years)}.csv",
-            mime="text/csv"
-        )
-    
-    else:
-        st.info("No high-quality quotes found matching your criteria. Try adjusting the filters.")
+    render_results(tuple(selected_years), tuple(selected_frames), selected_sort, historian)
     
     # Browser compatibility hint
     st.markdown(
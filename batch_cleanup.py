@@ -3,16 +3,20 @@
 
 import sqlite3
 import re
-import time
+
+# Preamble patterns, compiled once
+_RE_HERES = re.compile(r'Here.*?s my.*?analysis.*?:', re.IGNORECASE)
+_RE_HIST_FOLLOWS = re.compile(r'As a historian.*?follows:', re.IGNORECASE | re.DOTALL)
+_RE_HIST = re.compile(r'As a historian.*?:', re.IGNORECASE)
 
 def clean_analysis(text):
     if not text or len(text) < 50:
         return text
     
     # Remove preambles  
-    text = re.sub(r'Here.*?s my.*?analysis.*?:', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'As a historian.*?follows:', '', text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r'As a historian.*?:', '', text, flags=re.IGNORECASE)
+    text = _RE_HERES.sub('', text)
+    text = _RE_HIST_FOLLOWS.sub('', text)
+    text = _RE_HIST.sub('', text)
     
     # Get first meaningful sentence
     text = text.strip()
@@ -25,45 +29,45 @@ def clean_analysis(text):
     # Fallback
     return text[:150] + '...' if len(text) > 150 else text
 
-# Process in small batches
+# Process in small batches over a single connection
 batch_size = 50
 processed = 0
+last_id = 0
 
-while processed < 532:
-    try:
-        db = sqlite3.connect('database_updated.db')
-        
-        # Get batch
+db = sqlite3.connect('database_updated.db')
+db.execute('PRAGMA journal_mode=WAL')
+db.execute('PRAGMA synchronous=NORMAL')
+
+try:
+    while True:
+        # Get batch (keyset on id so gaps in ids don't skip rows)
         cursor = db.execute(
-            'SELECT id, historian_analysis FROM quotes WHERE id > ? AND historian_analysis IS NOT NULL LIMIT ?',
-            (processed, batch_size)
+            'SELECT id, historian_analysis FROM quotes WHERE id > ? AND historian_analysis IS NOT NULL ORDER BY id LIMIT ?',
+            (last_id, batch_size)
         )
         batch = cursor.fetchall()
         
         if not batch:
             break
-            
-        # Update batch
-        updated_in_batch = 0
+        
+        # Update batch in one statement, one commit
+        updates = []
         for quote_id, analysis in batch:
             if analysis and len(analysis) > 80:
                 cleaned = clean_analysis(analysis)
                 if cleaned != analysis:
-                    db.execute('UPDATE quotes SET historian_analysis = ? WHERE id = ?', (cleaned, quote_id))
-                    updated_in_batch += 1
+                    updates.append((cleaned, quote_id))
         
+        db.executemany('UPDATE quotes SET historian_analysis = ? WHERE id = ?', updates)
         db.commit()
         processed += len(batch)
+        last_id = batch[-1][0]
         
-        print(f'Processed batch: {processed} total, {updated_in_batch} updated in this batch')
-        
-        db.close()
-        time.sleep(0.1)  # Brief pause
+        print(f'Processed batch: {processed} total, {len(updates)} updated in this batch')
         
-    except Exception as e:
-        print(f'Error in batch starting at {processed}: {e}')
-        if 'db' in locals():
-            db.close()
-        break
+except Exception as e:
+    print(f'Error in batch starting at {processed}: {e}')
+finally:
+    db.close()
 
 print(f'✅ Completed processing {processed} analyses')
\ No newline at end of file
@@ -2,8 +2,21 @@
 # Extract more meaningful, longer quotes from the sections we found
 
 import requests, re, json, csv
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import date
-from bs4 import BeautifulSoup
+from html_text import html_to_text
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 BASE = "https://api.parliament.uk/historic-hansard"
 
@@ -12,123 +25,208 @@ MIG = r"(immigration|immigrant[s]?|migrant[s]?|alien[s]?|aliens|foreign(?:er|ers
 LAB = r"(labour\s*market|labor\s*market|wage[s]?|pay|employment|unemployment|job[s]?|workforce|manpower|strike[s]?|trade\s*union[s]?|working\s+(?:people|men|class)|sweating|competition)"
 NEAR = 100  # Increased proximity for more substantial arguments
 
+MIG_RE = re.compile(MIG)
+LAB_RE = re.compile(LAB)
+
+# Check for substantive content (not just procedural)
+SUBSTANTIVE_RES = [re.compile(p) for p in [
+    r'evidence\s+to\s+show',
+    r'argument[s]?\s+(?:in\s+support|against)',
+    r'ground[s]?\s+for\s+this\s+bill',
+    r'result\s+of\s+their\s+coming',
+    r'(?:increase|decrease)\s+(?:in\s+)?wage[s]?',
+    r'competition\s+(?:with|from)',
+    r'(?:depress|raise|affect)\s+(?:the\s+)?wage[s]?',
+    r'new\s+trades',
+    r'working\s+(?:people|men|class)',
+    r'sweating',
+    r'unemployment',
+    r'(?:benefit|harm|evil)\s+(?:done|caused)',
+]]
+
+# Single pass over a passage for all three tests. Substantive phrases go
+# first: several of them embed a labour term ("unemployment", "working
+# men"), so a labour hit is also read off the substantive match below.
+COMBINED_RE = re.compile(
+    "(?P<sub>" + "|".join(p.pattern for p in SUBSTANTIVE_RES) + ")"
+    "|(?P<mig>" + MIG + ")"
+    "|(?P<lab>" + LAB + ")"
+)
+
+# Common speaker patterns
+SPEAKER_RES = [re.compile(p) for p in [
+    r'(Mr\.|Mrs\.|Sir|Lord|Dr\.)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+    r'([A-Z][A-Z\s]+):',  # ALL CAPS NAME:
+    r'The\s+(Secretary|Minister|President|Chairman)',
+]]
+
+# Shared session so section fetches reuse connections; with requests_cache
+# installed, responses are also kept on disk for re-runs
+if requests_cache is not None:
+    SESSION = requests_cache.CachedSession("hansard_http_cache", backend="sqlite")
+else:
+    SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "HansardResearch/1.0"})
+
 def fetch_html(url):
-    r = requests.get(url, timeout=30, headers={"User-Agent":"HansardResearch/1.0"})
+    r = SESSION.get(url, timeout=30)
     r.raise_for_status()
     return r.text
 
-def words(text): 
-    return re.findall(r"\w[\w'-]*", text.lower())
+@dataclass(slots=True)
+class QuoteCandidate:
+    """A window of sentences that passed the quote filters"""
+    text: str
+    start_sentence: int
+    length: int
+    window_size: int
+    start_char: int  # offset of the passage's first character in the source text
+
+def split_sentences(text):
+    """Split text on runs of . ! ? -- same pieces as re.split(r'[.!?]+', text)
+
+    Returns the sentences and the character offset of each one in text.
+    """
+    parts = text.replace('!', '.').replace('?', '.').split('.')
+    sentences, starts = [], []
+    pos = 0
+    last = len(parts) - 1
+    for k, part in enumerate(parts):
+        # Empty pieces between two delimiters come from a run like '?!' or '...'
+        if part or k == 0 or k == last:
+            sentences.append(part)
+            starts.append(pos)
+        pos += len(part) + 1
+    return sentences, starts
 
 def find_substantial_quotes(text, min_length=150, max_length=500):
     """Find substantial quotes that discuss both immigration and labour"""
     
     # Split text into sentences (roughly)
-    sentences = re.split(r'[.!?]+', text)
+    sentences, starts = split_sentences(text)
+    sentences_lower = [s.lower() for s in sentences]
     quotes = []
     
-    # Look for substantial passages
-    for i in range(len(sentences)):
-        # Try different window sizes
-        for window_size in [3, 5, 7, 10]:  # 3-10 sentences
-            if i + window_size > len(sentences):
+    # Character offset of each sentence in the ' '-joined text, plus the
+    # whitespace strip() would trim from either end of it
+    offsets = [0]
+    for s in sentences:
+        offsets.append(offsets[-1] + len(s) + 1)
+    lead = [len(s) - len(s.lstrip()) for s in sentences]
+    trail = [len(s) - len(s.rstrip()) for s in sentences]
+    
+    # Flag the sentences each MIG/LAB match in the joined text touches. A
+    # passage can only match if one of these matches overlaps it, so windows
+    # with no flagged sentence for either term are skipped outright.
+    joined_lower = ' '.join(sentences_lower)
+    mig_flags = bytearray(len(sentences))
+    lab_flags = bytearray(len(sentences))
+    for pattern, flags in ((MIG_RE, mig_flags), (LAB_RE, lab_flags)):
+        for m in pattern.finditer(joined_lower):
+            first = bisect_right(offsets, m.start()) - 1
+            last = bisect_right(offsets, m.end() - 1) - 1
+            flags[first:last + 1] = b'\x01' * (last + 1 - first)
+    
+    # Look for substantial passages, sliding each window size across the sentences
+    for window_size in [3, 5, 7, 10]:  # 3-10 sentences
+        # Flagged sentences inside the current window, updated as it slides
+        mig_in = sum(mig_flags[:window_size])
+        lab_in = sum(lab_flags[:window_size])
+        
+        for i in range(len(sentences) - window_size + 1):
+            end = i + window_size
+            if i:
+                mig_in += mig_flags[end - 1] - mig_flags[i - 1]
+                lab_in += lab_flags[end - 1] - lab_flags[i - 1]
+            
+            if not (mig_in and lab_in):
+                continue
+            
+            # Length of the stripped passage, without building it. Only an
+            # upper bound if an end sentence is all whitespace.
+            approx_length = offsets[end] - offsets[i] - 1 - lead[i] - trail[end - 1]
+            if approx_length < min_length:
+                continue
+            if (approx_length > max_length
+                    and lead[i] < len(sentences[i])
+                    and trail[end - 1] < len(sentences[end - 1])):
                 continue
                 
-            passage = ' '.join(sentences[i:i+window_size]).strip()
+            passage = ' '.join(sentences[i:end]).strip()
             
             if len(passage) < min_length or len(passage) > max_length:
                 continue
             
             # Check if this passage has both terms
-            passage_lower = passage.lower()
-            has_mig = bool(re.search(MIG, passage_lower))
-            has_lab = bool(re.search(LAB, passage_lower))
+            passage_lower = ' '.join(sentences_lower[i:end]).strip()
+            has_mig = has_lab = has_sub = False
+            for m in COMBINED_RE.finditer(passage_lower):
+                if m.lastgroup == 'sub':
+                    has_sub = True
+                    has_lab = has_lab or bool(LAB_RE.search(m.group()))
+                elif m.lastgroup == 'mig':
+                    has_mig = True
+                else:
+                    has_lab = True
+                if has_mig and has_lab and has_sub:
+                    break
             
-            if has_mig and has_lab:
-                # Check for substantive content (not just procedural)
-                substantive_indicators = [
-                    r'evidence\s+to\s+show',
-                    r'argument[s]?\s+(?:in\s+support|against)',
-                    r'ground[s]?\s+for\s+this\s+bill',
-                    r'result\s+of\s+their\s+coming',
-                    r'(?:increase|decrease)\s+(?:in\s+)?wage[s]?',
-                    r'competition\s+(?:with|from)',
-                    r'(?:depress|raise|affect)\s+(?:the\s+)?wage[s]?',
-                    r'new\s+trades',
-                    r'working\s+(?:people|men|class)',
-                    r'sweating',
-                    r'unemployment',
-                    r'(?:benefit|harm|evil)\s+(?:done|caused)',
-                ]
-                
-                if any(re.search(pattern, passage_lower) for pattern in substantive_indicators):
-                    quotes.append({
-                        'text': passage,
-                        'start_sentence': i,
-                        'length': len(passage),
-                        'window_size': window_size
-                    })
+            if has_mig and has_lab and has_sub:
+                # Where the passage starts in text: its first non-blank sentence
+                first = i
+                while lead[first] == len(sentences[first]):
+                    first += 1
+                start_char = starts[first] + lead[first]
+                quotes.append(QuoteCandidate(passage, i, len(passage), window_size, start_char))
     
     # Remove overlapping quotes (prefer longer ones)
     final_quotes = []
-    quotes.sort(key=lambda x: (-x['length'], x['start_sentence']))  # Longer first, then earlier
+    accepted_masks = []  # one bit per sentence covered by each kept quote
+    quotes.sort(key=lambda x: (-x.length, x.start_sentence))  # Longer first, then earlier
     
     for quote in quotes:
-        # Check if this overlaps significantly with existing quotes
-        overlap = False
-        for existing in final_quotes:
-            # Check sentence overlap
-            existing_end = existing['start_sentence'] + existing['window_size']
-            quote_end = quote['start_sentence'] + quote['window_size']
-            
-            overlap_start = max(quote['start_sentence'], existing['start_sentence'])
-            overlap_end = min(quote_end, existing_end)
-            
-            if overlap_end > overlap_start:  # There's overlap
-                overlap_sentences = overlap_end - overlap_start
-                if overlap_sentences >= 2:  # 2+ sentence overlap
-                    overlap = True
-                    break
+        mask = ((1 << quote.window_size) - 1) << quote.start_sentence
+        
+        # Skip if this shares 2+ sentences with any existing quote
+        if any((mask & existing).bit_count() >= 2 for existing in accepted_masks):
+            continue
         
-        if not overlap:
-            final_quotes.append(quote)
+        final_quotes.append(quote)
+        accepted_masks.append(mask)
+        if len(final_quotes) == 3:
+            break
     
-    return final_quotes[:3]  # Return top 3 non-overlapping quotes
+    return final_quotes  # Top 3 non-overlapping quotes
 
-def extract_speaker_context(section_html, quote_text):
-    """Try to extract speaker for this specific quote"""
-    soup = BeautifulSoup(section_html, 'html.parser')
+def build_speaker_index(page_text):
+    """Find every speaker mention in a section once, per speaker pattern"""
+    speaker_index = []
+    for pattern in SPEAKER_RES:
+        starts, ends, names = [], [], []
+        for match in pattern.finditer(page_text):
+            starts.append(match.start())
+            ends.append(match.end())
+            if len(match.groups()) == 2:
+                names.append(f"{match.group(1)} {match.group(2)}")
+            else:
+                names.append(match.group(0))
+        speaker_index.append((starts, ends, names))
+    return speaker_index
+
+def extract_speaker_context(speaker_index, quote_start):
+    """Try to extract speaker for the quote starting at quote_start"""
+    # Look backwards for speaker name within the preceding 500 chars
+    window_start = max(0, quote_start - 500)
     
-    # Look for the quote text and find preceding speaker indicators
-    page_text = soup.get_text()
+    # Find the last speaker mention before the quote; a later pattern
+    # with a mention in range takes precedence over an earlier one
+    last_speaker = "Unknown Speaker"
+    for starts, ends, names in speaker_index:
+        idx = bisect_right(ends, quote_start) - 1
+        if idx >= 0 and starts[idx] >= window_start:
+            last_speaker = names[idx]
     
-    # Find where this quote appears
-    quote_start = page_text.lower().find(quote_text[:50].lower())
-    if quote_start > 0:
-        # Look backwards for speaker name
-        preceding_text = page_text[max(0, quote_start - 500):quote_start]
-        
-        # Common speaker patterns
-        speaker_patterns = [
-            r'(Mr\.|Mrs\.|Sir|Lord|Dr\.)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-            r'([A-Z][A-Z\s]+):',  # ALL CAPS NAME:
-            r'The\s+(Secretary|Minister|President|Chairman)',
-        ]
-        
-        # Find the last speaker mention before the quote
-        last_speaker = "Unknown Speaker"
-        for pattern in speaker_patterns:
-            matches = list(re.finditer(pattern, preceding_text))
-            if matches:
-                last_match = matches[-1]
-                if len(last_match.groups()) == 2:
-                    last_speaker = f"{last_match.group(1)} {last_match.group(2)}"
-                else:
-                    last_speaker = last_match.group(0)
-        
-        return last_speaker
-    
-    return "Unknown Speaker"
+    return last_speaker
 
 # Test with the sections we know work
 test_sections = [
@@ -141,13 +239,16 @@ print("=== EXTRACTING BETTER QUOTES ===")
 
 all_quotes = []
 
-for i, section_url in enumerate(test_sections):
+# Fetch all sections in parallel; results are read back in order below
+with ThreadPoolExecutor(max_workers=8) as executor:
+    pending = [executor.submit(fetch_html, url) for url in test_sections]
+
+for i, (section_url, future) in enumerate(zip(test_sections, pending)):
     print(f"\nSection {i+1}: {section_url.split('/')[-1]}")
     
     try:
-        section_html = fetch_html(section_url)
-        soup = BeautifulSoup(section_html, 'html.parser')
-        section_text = soup.get_text()
+        section_html = future.result()
+        section_text = html_to_text(section_html)
         
         # Extract title from URL
         section_title = section_url.split('/')[-1].replace('-', ' ').title()
@@ -158,11 +259,12 @@ for i, section_url in enumerate(test_sections):
         quotes = find_substantial_quotes(section_text)
         print(f"  Found {len(quotes)} substantial quotes")
         
+        speaker_index = build_speaker_index(section_text)
         for j, quote in enumerate(quotes):
-            speaker = extract_speaker_context(section_html, quote['text'])
+            speaker = extract_speaker_context(speaker_index, quote.start_char)
             
             # Clean up the quote text
-            clean_quote = re.sub(r'\s+', ' ', quote['text']).strip()
+            clean_quote = re.sub(r'\s+', ' ', quote.text).strip()
             
             all_quotes.append({
                 "date": "1905-05-02",
@@ -174,7 +276,7 @@ for i, section_url in enumerate(test_sections):
                 "hansard_url": section_url
             })
             
-            print(f"    Quote {j+1} ({quote['length']} chars) - {speaker}:")
+            print(f"    Quote {j+1} ({quote.length} chars) - {speaker}:")
             print(f"      {clean_quote[:150]}...")
             
     except Exception as e:
@@ -185,9 +287,12 @@ print(f"\n=== RESULTS ===")
 print(f"Total substantial quotes: {len(all_quotes)}")
 
 if all_quotes:
-    with open("quotes_substantial.jsonl","w",encoding="utf-8") as f:
-        for r in all_quotes:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    if orjson is not None:
+        with open("quotes_substantial.jsonl","wb") as f:
+            f.writelines(orjson.dumps(r) + b"\n" for r in all_quotes)
+    else:
+        with open("quotes_substantial.jsonl","w",encoding="utf-8") as f:
+            f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in all_quotes)
 
     with open("quotes_substantial.csv","w",newline="",encoding="utf-8") as f:
         w = csv.DictWriter(f, fieldnames=list(all_quotes[0].keys()))
@@ -4,7 +4,35 @@
 from updated_hybrid_collector import UpdatedHybridCollector
 from enhanced_quote_logic import EnhancedQuoteExtractor
 import requests
-from bs4 import BeautifulSoup
+import re
+from bisect import bisect_left
+from html_text import html_to_text
+
+# Quality indicator patterns, compiled once rather than per quote
+ARGUMENT_PATTERNS = [re.compile(p) for p in [
+    r'\b(argue|maintain|contend|assert|claim|believe|submit|urge|propose)\b',
+    r'\b(I\s+(?:think|believe|maintain|argue|submit))\b',
+    r'\b(it\s+is\s+(?:clear|evident|obvious|certain))\b'
+]]
+
+POLICY_PATTERNS = [re.compile(p) for p in [
+    r'\b(bill|act|legislation|measure|policy|government|committee)\b',
+    r'\b(second\s+reading|third\s+reading|amendment|clause)\b',
+    r'\b(house|parliament|member|hon\.?\s+member)\b'
+]]
+
+ECONOMIC_RE = re.compile(r'\b\d+(?:[,%]\d+)*\s*(?:%|per\s+cent|pounds?|£)\b')
+DIRECT_SPEECH_RE = re.compile(r'\b(hon\.?\s+member|right\s+hon\.?\s+gentleman|minister)\b')
+
+# All four indicator families in one alternation, so a quote is scanned once.
+# Direct speech goes before policy: "hon. member" belongs to both, and a
+# policy hit is read off the direct speech match when it contains one.
+QUALITY_RE = re.compile("|".join([
+    "(?P<argument>" + "|".join(p.pattern for p in ARGUMENT_PATTERNS) + ")",
+    "(?P<economic>" + ECONOMIC_RE.pattern + ")",
+    "(?P<direct>" + DIRECT_SPEECH_RE.pattern + ")",
+    "(?P<policy>" + "|".join(p.pattern for p in POLICY_PATTERNS) + ")",
+]))
 
 class CalibratedCollector(UpdatedHybridCollector):
     """Collector with calibrated word count thresholds"""
@@ -25,8 +53,7 @@ class CalibratedCollector(UpdatedHybridCollector):
             response.raise_for_status()
             
             # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            full_text = soup.get_text()
+            full_text = html_to_text(response.text)
             
             # Quick proximity check
             passes, _, _ = self.quote_extractor.precise_proximity_test(full_text)
@@ -37,6 +64,7 @@ class CalibratedCollector(UpdatedHybridCollector):
             
             # Find speakers
             speaker_positions = self.find_speaker_boundaries(full_text)
+            boundary_positions = [info['position'] for info in speaker_positions]
             
             # Extract quotes with calibrated thresholds
             quotes = self.quote_extractor.extract_word_based_quotes(
@@ -52,12 +80,10 @@ class CalibratedCollector(UpdatedHybridCollector):
                 # Find speaker for this quote
                 quote_text = quote_data['text']
                 quote_pos = full_text.find(quote_text[:50])
-                speaker = "Unknown Speaker"
                 
-                for speaker_info in reversed(speaker_positions):
-                    if speaker_info['position'] < quote_pos:
-                        speaker = speaker_info['speaker']
-                        break
+                # Last speaker boundary strictly before the quote
+                idx = bisect_left(boundary_positions, quote_pos) - 1
+                speaker = speaker_positions[idx]['speaker'] if idx >= 0 else "Unknown Speaker"
                 
                 # Generate dedup key
                 dedup_key = self.generate_dedup_key(url, speaker, quote_text)
@@ -120,35 +146,17 @@ class CalibratedCollector(UpdatedHybridCollector):
         elif mig_count >= 1 and lab_count >= 1:
             score += 1  # Minimum density
         
-        # Argument structure indicators
-        argument_patterns = [
-            r'\b(argue|maintain|contend|assert|claim|believe|submit|urge|propose)\b',
-            r'\b(I\s+(?:think|believe|maintain|argue|submit))\b',
-            r'\b(it\s+is\s+(?:clear|evident|obvious|certain))\b'
-        ]
-        for pattern in argument_patterns:
-            if re.search(pattern, quote_text):
-                score += 1
+        # Argument structure, policy/legislative context, economic and
+        # direct speech indicators: one point per family present
+        found = set()
+        for match in QUALITY_RE.finditer(quote_text):
+            found.add(match.lastgroup)
+            if match.lastgroup == 'direct' and any(
+                    pattern.search(match.group()) for pattern in POLICY_PATTERNS):
+                found.add('policy')
+            if len(found) == 4:
                 break
-        
-        # Policy/legislative context
-        policy_patterns = [
-            r'\b(bill|act|legislation|measure|policy|government|committee)\b',
-            r'\b(second\s+reading|third\s+reading|amendment|clause)\b',
-            r'\b(house|parliament|member|hon\.?\s+member)\b'
-        ]
-        for pattern in policy_patterns:
-            if re.search(pattern, quote_text):
-                score += 1
-                break
-        
-        # Economic indicators (numbers, statistics, economic terms)
-        if re.search(r'\b\d+(?:[,%]\d+)*\s*(?:%|per\s+cent|pounds?|£)\b', quote_text):
-            score += 1
-        
-        # Direct speech/debate indicators
-        if re.search(r'\b(hon\.?\s+member|right\s+hon\.?\s+gentleman|minister)\b', quote_text):
-            score += 1
+        score += len(found)
         
         return score
 
@@ -174,8 +182,7 @@ def test_calibrated_thresholds():
     try:
         response = session.get(url, timeout=45)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        full_text = soup.get_text()
+        full_text = html_to_text(response.text)
         
         print(f"Testing on Aliens Bill debate ({len(full_text)} chars)")
         
@@ -3,16 +3,50 @@
 
 import requests
 import calendar
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+
+WORKERS = 8  # dates probed at once
+
+def probe_url(session, url):
+    """True if the URL serves a page of more than 1000 characters"""
+    # HEAD is enough when the server reports the size; asking for an
+    # unencoded body makes Content-Length the page's own size, not a gzip's
+    response = session.head(url, timeout=5, allow_redirects=True,
+                            headers={"Accept-Encoding": "identity"})
+    if response.status_code != 200:
+        return False
+    content_length = response.headers.get("Content-Length")
+    if content_length is not None:
+        return int(content_length) > 1000
+    # No size given (e.g. a chunked response), so fetch the page and measure it
+    response = session.get(url, timeout=5)
+    return response.status_code == 200 and len(response.text) > 1000
+
+def probe_date(session, urls):
+    """Return True if any of the URLs serves a sitting page"""
+    for url in urls:
+        try:
+            if probe_url(session, url):
+                return True
+        except (requests.RequestException, ValueError):
+            continue
+    return False
 
 def check_year_availability(year):
     """Check how many sittings are available for a given year"""
     print(f"\n=== Checking {year} ===")
     
+    # This probes live availability, so it always goes to the network; the
+    # pool is sized so every worker keeps its connection alive
     session = requests.Session()
     session.headers.update({"User-Agent": "HansardResearch/1.0"})
+    adapter = HTTPAdapter(pool_connections=WORKERS, pool_maxsize=WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
     
-    available_sittings = 0
-    checked_dates = 0
+    # Every date to probe, each with its URL patterns in preference order
+    probes = []
     
     # Check a sample of dates throughout the year
     for month in range(1, 13, 2):  # Check every other month
@@ -30,23 +64,22 @@ def check_year_availability(year):
         test_days = [1, days_in_month // 2, days_in_month]
         
         for day in test_days:
-            checked_dates += 1
-            
             # Try different URL patterns
-            url_patterns = [
+            probes.append([
                 f"https://api.parliament.uk/historic-hansard/commons/{year}/{month_name}/{day:02d}",
                 f"https://api.parliament.uk/historic-hansard/sittings/{year}/{month_name}/{day:02d}",
                 f"https://api.parliament.uk/historic-hansard/lords/{year}/{month_name}/{day:02d}"
-            ]
-            
-            for url in url_patterns:
-                try:
-                    response = session.get(url, timeout=5)
-                    if response.status_code == 200 and len(response.text) > 1000:
-                        available_sittings += 1
-                        break
-                except:
-                    continue
+            ])
+    
+    checked_dates = len(probes)
+    available_sittings = 0
+    
+    # Dates are independent, so probe them in parallel
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        futures = [executor.submit(probe_date, session, urls) for urls in probes]
+        for future in as_completed(futures):
+            if future.result():
+                available_sittings += 1
     
     availability_rate = (available_sittings / checked_dates) * 100
     print(f"  Available sittings: {available_sittings}/{checked_dates} ({availability_rate:.1f}%)")
@@ -4,10 +4,22 @@
 import requests
 from bs4 import BeautifulSoup
 
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
 BASE = "https://api.parliament.uk/historic-hansard"
 
+# Responses are kept on disk for re-runs when requests_cache is installed
+if requests_cache is not None:
+    SESSION = requests_cache.CachedSession("hansard_http_cache", backend="sqlite")
+else:
+    SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "HansardResearch/1.0"})
+
 def fetch_html(url):
-    r = requests.get(url, timeout=30, headers={"User-Agent":"HansardResearch/1.0"})
+    r = SESSION.get(url, timeout=30)
     r.raise_for_status()
     return r.text
 
@@ -2,10 +2,29 @@
 # Check what real data was collected vs sample data
 
 import sqlite3
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+
+def check_url(session, url):
+    """HEAD a quote URL and describe the outcome"""
+    try:
+        response = session.head(url, timeout=10, allow_redirects=False)
+        return f"HTTP {response.status_code}"
+    except requests.RequestException:
+        return "UNREACHABLE"
 
 # Connect to database
 conn = sqlite3.connect("hansard_simple.db")
 
+# URL checks are remembered in the quotes table, so re-runs only probe
+# URLs that are new or were last checked more than a week ago
+for column in ("url_status", "url_checked_at"):
+    try:
+        conn.execute(f"ALTER TABLE quotes ADD COLUMN {column} TEXT")
+    except sqlite3.OperationalError:
+        pass  # Column already added by an earlier run
+
 # Get all quotes
 all_quotes = conn.execute("""
     SELECT year, date, speaker, frame, quote, hansard_url
@@ -13,9 +32,47 @@ all_quotes = conn.execute("""
     ORDER BY year, date
 """).fetchall()
 
+# Reuse a URL's status only if every quote with that URL has a fresh one
+url_statuses = dict(conn.execute("""
+    SELECT hansard_url, MAX(url_status)
+    FROM quotes
+    GROUP BY hansard_url
+    HAVING MIN(url_status IS NOT NULL AND url_checked_at >= date('now', '-7 days')) = 1
+"""))
+
 print("=== ALL QUOTES IN DATABASE ===")
 print(f"Total: {len(all_quotes)} quotes\n")
 
+# Check if URLs actually exist, all at once over a shared session. This is a
+# liveness check, so it always goes to the network: the url_status columns
+# above are the only cache, and they expire after a week
+session = requests.Session()
+
+# Size the connection pool to the worker count so every thread keeps its
+# connection alive between requests
+adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+
+# Many quotes share a debate URL, so each distinct URL is checked once
+checked = []
+with session, ThreadPoolExecutor(max_workers=32) as executor:
+    futures = {
+        executor.submit(check_url, session, url): url
+        for url in {row[5] for row in all_quotes} - url_statuses.keys()
+    }
+    for future in as_completed(futures):
+        url = futures[future]
+        url_statuses[url] = future.result()
+        checked.append((url_statuses[url], url))
+
+conn.executemany(
+    "UPDATE quotes SET url_status = ?, url_checked_at = date('now') WHERE hansard_url = ?",
+    checked
+)
+conn.commit()
+print(f"Checked {len(checked)} URLs ({len(url_statuses) - len(checked)} recent results reused)\n")
+
 for i, (year, date, speaker, frame, quote, url) in enumerate(all_quotes, 1):
     print(f"Quote {i}:")
     print(f"  Date: {date}")
@@ -24,16 +81,7 @@ for i, (year, date, speaker, frame, quote, url) in enumerate(all_quotes, 1):
     print(f"  URL: {url}")
     print(f"  Quote: {quote[:100]}...")
     print(f"  Full length: {len(quote)} characters")
-    
-    # Check if URL actually exists
-    import requests
-    try:
-        response = requests.head(url, timeout=10)
-        url_status = f"HTTP {response.status_code}"
-    except:
-        url_status = "UNREACHABLE"
-    
-    print(f"  URL status: {url_status}")
+    print(f"  URL status: {url_statuses[url]}")
     print()
 
 conn.close()
@@ -2,11 +2,129 @@
 # Claude AI-powered historian for superior historical analysis
 
 import sqlite3
+import hashlib
+import re
 from anthropic import Anthropic
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 import os
 
+# Claude works better with structured, detailed prompts. These instructions are
+# identical for every quote, so they go in the system prompt; the quote itself
+# comes from create_claude_prompt.
+HISTORIAN_INSTRUCTIONS = """You are a distinguished historian specializing in British immigration and labour policy (1900-1930). Provide a sophisticated historical analysis of the parliamentary quote you are given.
+
+**ANALYSIS REQUEST:**
+Write a concise but insightful historical analysis (2-3 sentences, max 200 words) that demonstrates:
+
+1. **Specific Argument Identification**: What precise political or economic argument is being made?
+2. **Historical Contextualization**: How does this reflect broader political/social tensions of its year?  
+3. **Parliamentary Strategy**: What does this reveal about political tactics or coalition-building?
+4. **Significance**: Why does this matter for understanding British immigration/labour policy development?
+
+**ANALYTICAL FRAMEWORK:**
+Consider these historical dimensions:
+• Economic conditions and labour market pressures
+• Political party positioning and electoral considerations  
+• Social tensions around immigration and national identity
+• Imperial context and international comparisons
+• Class dynamics and trade union concerns
+
+**STYLE REQUIREMENTS:**
+• Academic precision with scholarly vocabulary
+• Avoid presentist interpretations or modern terminology
+• Connect to broader historical patterns and significance
+• Be specific about causal relationships and implications
+
+**AVOID:**
+• Generic phrases like "discusses immigration policy"
+• Mere description without analytical insight
+• Anachronistic language or concepts
+• Overly technical jargon without explanation
+
+Provide nuanced historical interpretation that illuminates the political and social dynamics of the period."""
+
+# Only the per-quote details go in the user message; the instructions
+# above are sent as the system prompt by get_claude_analysis.
+# The year lines depend on nothing else, so they are built once per year.
+PROMPT_HEAD = """**QUOTE TO ANALYZE:**
+"{quote}"
+
+**CONTEXT:**
+• Speaker: {speaker}
+"""
+
+PROMPT_YEAR_LINES = """• Year: {year} 
+• Historical Period: {historical_context}
+• Debate Classification: """
+
+CLAUDE_MODEL = "claude-3-5-sonnet-20241022"  # Latest Claude model, excellent for analysis
+
+# Request settings shared by the streaming and batch paths
+CLAUDE_PARAMS = {
+    "model": CLAUDE_MODEL,
+    "max_tokens": 300,  # Enough for detailed analysis
+    "temperature": 0.3,  # Lower temperature for more consistent analysis
+}
+
+# Message Batches API accepts up to 100,000 requests per batch; smaller batches
+# finish (and get written back) sooner
+BATCH_SIZE = 10000
+
+# Rows buffered between commits when writing analyses back
+COMMIT_EVERY = 500
+
+# A streamed response that goes this many seconds without a chunk is treated
+# as a dead connection and retried, up to STREAM_ATTEMPTS times
+STREAM_STALL_TIMEOUT = 30
+STREAM_ATTEMPTS = 3
+
+# Analyses requested at once by regenerate_all_analyses, and the request rate
+# they share (50/min is the entry API tier; raise it for higher tiers)
+CLAUDE_WORKERS = 10
+REQUESTS_PER_MINUTE = 50
+
+# No cache_control: at ~300 tokens the instructions are under the 1024-token
+# minimum for a cacheable prefix, so a breakpoint would never be used
+SYSTEM_PROMPT = [
+    {"type": "text", "text": HISTORIAN_INSTRUCTIONS}
+]
+
+# Fallback analysis: the first quoted (or QUOTE:) line and the year line of a
+# prompt, and the terms that every content-based fallback needs at least one of
+QUOTE_LINE_RE = re.compile(r'^(?:QUOTE:|.*").*$', re.MULTILINE)
+YEAR_LINE_RE = re.compile(r'^• Year:.*$', re.MULTILINE)
+FALLBACK_TERMS_RE = re.compile(r'beg to ask|aliens act|exclusion|expulsion|east end|whitechapel|unemployment|wage')
+
+class RateLimiter:
+    """Spaces calls evenly so that all threads together stay under a per-minute cap"""
+    
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        time.sleep(slot - now)
+
+# Everything besides the user prompt that shapes an analysis; a change to the
+# model, its settings or the instructions gives every prompt a new cache key
+REQUEST_FINGERPRINT = "\x1f".join(
+    [f"{name}={value}" for name, value in sorted(CLAUDE_PARAMS.items())] + [HISTORIAN_INSTRUCTIONS]
+).encode()
+
+def prompt_key(prompt) -> bytes:
+    """Hash a rendered prompt with the request settings, for deduplication and caching"""
+    digest = hashlib.blake2b(REQUEST_FINGERPRINT, digest_size=16)
+    digest.update(b"\x1e" + prompt.encode())
+    return digest.digest()
+
 class ClaudeHistorian:
     """Claude AI-powered historian - optimized for historical analysis"""
     
@@ -22,6 +140,8 @@ class ClaudeHistorian:
             print("Warning: No Claude API key provided. Set ANTHROPIC_API_KEY environment variable or pass api_key parameter.")
             self.client = None
         
+        self.rate_limiter = RateLimiter(REQUESTS_PER_MINUTE)
+        
         # Historical contexts optimized for Claude
         self.historical_contexts = {
             1900: "era of New Imperialism and growing concerns about mass immigration from Eastern Europe",
@@ -56,132 +176,148 @@ class ClaudeHistorian:
             1929: "economic optimism before Wall Street Crash and global depression onset",
             1930: "Great Depression's arrival bringing mass unemployment and political upheaval"
         }
+        
+        self.year_lines = {
+            year: PROMPT_YEAR_LINES.format(year=year, historical_context=context)
+            for year, context in self.historical_contexts.items()
+        }
 
     def create_claude_prompt(self, quote: str, speaker: str, year: int, frame: str) -> str:
         """Create optimized prompt for Claude's historical analysis strengths"""
         
-        historical_context = self.historical_contexts.get(year, f"complex political and economic conditions of {year}")
+        year_lines = self.year_lines.get(year)
+        if year_lines is None:
+            year_lines = self.year_lines[year] = PROMPT_YEAR_LINES.format(
+                year=year, historical_context=f"complex political and economic conditions of {year}")
         
-        # Claude works better with structured, detailed prompts
-        prompt = f"""You are a distinguished historian specializing in British immigration and labour policy (1900-1930). Provide a sophisticated historical analysis of this parliamentary quote.
-
-**QUOTE TO ANALYZE:**
-"{quote}"
-
-**CONTEXT:**
-• Speaker: {speaker}
-• Year: {year} 
-• Historical Period: {historical_context}
-• Debate Classification: {frame}
-
-**ANALYSIS REQUEST:**
-Write a concise but insightful historical analysis (2-3 sentences, max 200 words) that demonstrates:
-
-1. **Specific Argument Identification**: What precise political or economic argument is being made?
-2. **Historical Contextualization**: How does this reflect broader {year} political/social tensions?  
-3. **Parliamentary Strategy**: What does this reveal about political tactics or coalition-building?
-4. **Significance**: Why does this matter for understanding British immigration/labour policy development?
-
-**ANALYTICAL FRAMEWORK:**
-Consider these historical dimensions:
-• Economic conditions and labour market pressures
-• Political party positioning and electoral considerations  
-• Social tensions around immigration and national identity
-• Imperial context and international comparisons
-• Class dynamics and trade union concerns
-
-**STYLE REQUIREMENTS:**
-• Academic precision with scholarly vocabulary
-• Avoid presentist interpretations or modern terminology
-• Connect to broader historical patterns and significance
-• Be specific about causal relationships and implications
-
-**AVOID:**
-• Generic phrases like "discusses immigration policy"
-• Mere description without analytical insight
-• Anachronistic language or concepts
-• Overly technical jargon without explanation
-
-Provide nuanced historical interpretation that illuminates the political and social dynamics of the period."""
-
-        return prompt
+        return PROMPT_HEAD.format(quote=quote, speaker=speaker) + year_lines + str(frame)
 
     def get_claude_analysis(self, prompt: str) -> str:
         """Get analysis from Claude API"""
         
-        if not self.client:
+        analysis = self.request_claude_analysis(prompt)
+        if analysis is None:
+            # Fallback to enhanced rule-based analysis
             return self.generate_fallback_analysis(prompt)
+        return analysis
+
+    def request_claude_analysis(self, prompt: str) -> Optional[str]:
+        """Ask Claude for an analysis, or return None if the API is unavailable"""
         
-        try:
-            response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",  # Latest Claude model, excellent for analysis
-                max_tokens=300,  # Enough for detailed analysis
-                temperature=0.3,  # Lower temperature for more consistent analysis
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+        if not self.client:
+            return None
+        
+        for attempt in range(STREAM_ATTEMPTS):
+            self.rate_limiter.wait()
+            try:
+                return self.stream_claude_analysis(prompt)
+                
+            except TimeoutError as e:
+                print(f"Claude API stalled (attempt {attempt + 1}/{STREAM_ATTEMPTS}): {e}")
+                time.sleep(2 ** attempt)  # Back off before reconnecting
+                
+            except Exception as e:
+                print(f"Claude API error: {e}")
+                break
+        
+        return None
+
+    def stream_claude_analysis(self, prompt: str) -> str:
+        """Stream one analysis, aborting if the connection goes quiet"""
+        
+        # The SDK timeout covers connecting and the response headers; once
+        # text is flowing a watchdog closes the stream if chunks stop arriving
+        with self.client.messages.stream(
+            **CLAUDE_PARAMS,
+            system=SYSTEM_PROMPT,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            timeout=STREAM_STALL_TIMEOUT
+        ) as stream:
+            last_chunk = [time.monotonic()]
+            finished = threading.Event()
+            stalled = threading.Event()
             
-            analysis = response.content[0].text.strip()
-            return analysis
+            def watchdog():
+                while not finished.wait(1):
+                    if time.monotonic() - last_chunk[0] > STREAM_STALL_TIMEOUT:
+                        stalled.set()
+                        stream.close()
+                        return
             
-        except Exception as e:
-            print(f"Claude API error: {e}")
-            # Fallback to enhanced rule-based analysis
-            return self.generate_fallback_analysis(prompt)
+            threading.Thread(target=watchdog, daemon=True).start()
+            
+            chunks = []
+            try:
+                for text in stream.text_stream:
+                    chunks.append(text)
+                    last_chunk[0] = time.monotonic()
+            except Exception:
+                if stalled.is_set():
+                    raise TimeoutError(f"no response chunk for {STREAM_STALL_TIMEOUT}s")
+                raise
+            finally:
+                finished.set()
+            
+            if stalled.is_set():
+                raise TimeoutError(f"no response chunk for {STREAM_STALL_TIMEOUT}s")
+        
+        analysis = "".join(chunks).strip()
+        return analysis
 
     def generate_fallback_analysis(self, prompt: str) -> str:
         """Enhanced fallback analysis if API fails"""
         
         # Extract key info from prompt
-        lines = prompt.split('\n')
-        quote_line = next((line for line in lines if line.startswith('QUOTE:') or '"' in line), "")
-        year_line = next((line for line in lines if line.startswith('• Year:')), "")
+        quote_match = QUOTE_LINE_RE.search(prompt)
+        year_match = YEAR_LINE_RE.search(prompt)
         
-        if quote_line and year_line:
-            quote = quote_line.replace('QUOTE TO ANALYZE:', '').replace('"', '').lower().strip()
-            year = int(year_line.replace('• Year: ', '').strip())
-            
-            # Enhanced content-based analysis
-            if 'beg to ask' in quote and 'secretary of state' in quote:
-                if 'colonies' in quote:
-                    return f"Parliamentary inquiry into colonial labour policies reflecting {year} concerns about imperial economic development and settler-indigenous labour competition."
-                elif 'home department' in quote:
-                    return f"Seeks government data on immigration enforcement, illustrating parliamentary oversight of administrative implementation during {year} policy development."
-                else:
-                    return f"Parliamentary question demanding ministerial accountability on immigration policy during {year} administrative challenges."
-            
-            elif 'aliens act' in quote and year == 1905:
-                return "Addresses Britain's landmark 1905 Aliens Act, the nation's first comprehensive immigration legislation targeting Eastern European Jewish refugees."
-            
-            elif 'exclusion' in quote or 'expulsion' in quote:
-                if year >= 1914 and year <= 1918:
-                    return f"Wartime advocacy for restrictive enforcement reflecting {year} national security concerns and anti-alien sentiment."
-                else:
-                    return f"Supports immigration restriction reflecting {year} economic anxieties and rising nativist political pressure."
-            
-            elif 'east end' in quote or 'whitechapel' in quote:
-                return f"References East London overcrowding and social tensions that galvanized middle-class support for immigration controls during {year} urban crisis."
-            
-            elif 'unemployment' in quote and ('alien' in quote or 'foreign' in quote):
-                if year >= 1919:
-                    return f"Links immigration to post-war unemployment crisis as demobilized veterans competed for scarce employment opportunities."
-                else:
-                    return f"Connects foreign labour to domestic joblessness during {year} economic uncertainty and labour market pressures."
-            
-            elif 'wage' in quote and ('competition' in quote or 'reduce' in quote):
-                return f"Economic argument about immigrant wage competition reflecting {year} labour movement concerns and trade union political influence."
+        if quote_match and year_match:
+            quote = quote_match.group().replace('QUOTE TO ANALYZE:', '').replace('"', '').lower().strip()
+            year = int(year_match.group().replace('• Year: ', '').strip())
+            
+            # Enhanced content-based analysis; every branch needs one of
+            # FALLBACK_TERMS_RE's terms, so one scan rules them all out for most quotes
+            if FALLBACK_TERMS_RE.search(quote):
+                if 'beg to ask' in quote and 'secretary of state' in quote:
+                    if 'colonies' in quote:
+                        return f"Parliamentary inquiry into colonial labour policies reflecting {year} concerns about imperial economic development and settler-indigenous labour competition."
+                    elif 'home department' in quote:
+                        return f"Seeks government data on immigration enforcement, illustrating parliamentary oversight of administrative implementation during {year} policy development."
+                    else:
+                        return f"Parliamentary question demanding ministerial accountability on immigration policy during {year} administrative challenges."
+            
+                elif 'aliens act' in quote and year == 1905:
+                    return "Addresses Britain's landmark 1905 Aliens Act, the nation's first comprehensive immigration legislation targeting Eastern European Jewish refugees."
             
+                elif 'exclusion' in quote or 'expulsion' in quote:
+                    if year >= 1914 and year <= 1918:
+                        return f"Wartime advocacy for restrictive enforcement reflecting {year} national security concerns and anti-alien sentiment."
+                    else:
+                        return f"Supports immigration restriction reflecting {year} economic anxieties and rising nativist political pressure."
+            
+                elif 'east end' in quote or 'whitechapel' in quote:
+                    return f"References East London overcrowding and social tensions that galvanized middle-class support for immigration controls during {year} urban crisis."
+            
+                elif 'unemployment' in quote and ('alien' in quote or 'foreign' in quote):
+                    if year >= 1919:
+                        return f"Links immigration to post-war unemployment crisis as demobilized veterans competed for scarce employment opportunities."
+                    else:
+                        return f"Connects foreign labour to domestic joblessness during {year} economic uncertainty and labour market pressures."
+            
+                elif 'wage' in quote and ('competition' in quote or 'reduce' in quote):
+                    return f"Economic argument about immigrant wage competition reflecting {year} labour movement concerns and trade union political influence."
+            
+            # Context-specific fallbacks
+            if year == 1905:
+                return "Contributes to historic 1905 Aliens Act parliamentary debates establishing Britain's first systematic immigration controls."
+            elif year >= 1919 and year <= 1922:
+                return f"Reflects post-war reconstruction debates balancing economic recovery needs with veterans' employment concerns."
+            elif year >= 1926 and year <= 1930:
+                return f"Part of later 1920s immigration discourse amid economic depression and rising unemployment pressures."
             else:
-                # Context-specific fallbacks
-                if year == 1905:
-                    return "Contributes to historic 1905 Aliens Act parliamentary debates establishing Britain's first systematic immigration controls."
-                elif year >= 1919 and year <= 1922:
-                    return f"Reflects post-war reconstruction debates balancing economic recovery needs with veterans' employment concerns."
-                elif year >= 1926 and year <= 1930:
-                    return f"Part of later 1920s immigration discourse amid economic depression and rising unemployment pressures."
-                else:
-                    return f"Represents parliamentary engagement with immigration policy during {year} broader political and economic transformations."
+                return f"Represents parliamentary engagement with immigration policy during {year} broader political and economic transformations."
         
         return "Parliamentary contribution to British immigration policy debates."
 
@@ -226,53 +362,170 @@ Provide nuanced historical interpretation that illuminates the political and soc
         finally:
             conn.close()
 
-    def regenerate_all_analyses(self, limit=None, start_id=1) -> int:
-        """Regenerate all analyses using Claude API"""
+    def _select_quotes(self, conn, limit, start_id, only_missing):
+        """Cursor over the quotes to analyse, optionally only those without an analysis yet"""
+        
+        query = "SELECT id, quote, speaker, year, frame FROM quotes WHERE id >= ?"
+        if only_missing:
+            # Partial index holding just the rows that still need an analysis
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_quotes_pending ON quotes(id) WHERE historian_analysis IS NULL")
+            query += " AND historian_analysis IS NULL"
+        query += " ORDER BY id"
+        
+        if limit:
+            return conn.execute(query + " LIMIT ?", (start_id, limit))
+        return conn.execute(query, (start_id,))
+
+    def _group_quotes(self, cursor):
+        """Group quote rows by prompt_key; returns ({key: (prompt, quote_ids)}, row count)"""
+        
+        # Identical prompts get identical analyses, so Claude is asked once per
+        # distinct prompt. Rows are read straight off the cursor; only one copy
+        # of each distinct prompt is kept in memory
+        groups = {}
+        total = 0
+        for quote_id, quote, speaker, year, frame in cursor:
+            total += 1
+            prompt = self.create_claude_prompt(quote, speaker, year, frame)
+            key = prompt_key(prompt)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = (prompt, [])
+            group[1].append(quote_id)
+        return groups, total
+
+    def _pending_analyses(self, conn, groups, use_cache):
+        """Analyses still to request as a (key, prompt, quote_ids) list, and rows already written back"""
+        
+        self._create_cache_table(conn)
+        if use_cache:
+            return self._answer_from_cache(conn, groups)
+        print(f"Analysis cache bypassed, {len(groups)} prompts to send")
+        return [(key, prompt, quote_ids) for key, (prompt, quote_ids) in groups.items()], 0
+
+    def _create_cache_table(self, conn):
+        """Create analysis_cache, or add created_at to a table from an older version"""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                hash BLOB PRIMARY KEY,
+                analysis TEXT,
+                created_at INTEGER
+            )
+        """)
+        try:
+            conn.execute("ALTER TABLE analysis_cache ADD COLUMN created_at INTEGER")
+        except sqlite3.OperationalError:
+            pass  # Table already has the column
+
+    def _answer_from_cache(self, conn, groups):
+        """Write back cached analyses; returns (uncached (key, prompt, quote_ids) list, rows written)"""
+        
+        # Reuse analyses computed on an earlier run or another shard
+        pending = []
+        updates = []
+        for key, (prompt, quote_ids) in groups.items():
+            row = conn.execute("SELECT analysis FROM analysis_cache WHERE hash = ?", (key,)).fetchone()
+            if row:
+                updates.extend((row[0], quote_id) for quote_id in quote_ids)
+            else:
+                pending.append((key, prompt, quote_ids))
+        
+        answered = len(updates)
+        self._save_analyses(conn, updates)
+        print(f"{len(groups) - len(pending)} prompts answered from the analysis cache, {len(pending)} to send")
+        return pending, answered
+
+    def _cache_analysis(self, conn, key, analysis):
+        """Store a Claude analysis under its prompt hash (committed with the next write-back)"""
+        conn.execute("""
+            INSERT INTO analysis_cache (hash, analysis, created_at) VALUES (?, ?, ?)
+            ON CONFLICT(hash) DO UPDATE SET analysis = excluded.analysis, created_at = excluded.created_at
+        """, (key, analysis, int(time.time())))
+
+    def _analyze_one(self, prompt):
+        """Return (analysis, True) from Claude, or (fallback analysis, False)"""
+        analysis = self.request_claude_analysis(prompt)
+        if analysis is None:
+            return self.generate_fallback_analysis(prompt), False
+        return analysis, True
+
+    def _save_analyses(self, conn, updates):
+        """Write buffered (analysis, quote_id) pairs in one transaction and clear the buffer"""
+        if not updates:
+            return
+        conn.executemany("""
+            UPDATE quotes 
+            SET historian_analysis = ? 
+            WHERE id = ?
+        """, updates)
+        conn.commit()
+        updates.clear()
+
+    def regenerate_all_analyses(self, limit=None, start_id=1, only_missing=False, use_cache=True) -> int:
+        """Regenerate all analyses using Claude API (only_missing resumes an interrupted run)
+
+        With use_cache=False every prompt goes to Claude even if the analysis
+        cache holds an answer for it, e.g. to replace analyses that were
+        rewritten by the cleanup scripts; the fresh answers replace the cached ones.
+        """
         
         conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
         processed = 0
+        updates = []
         
         try:
             # Get quotes to process
-            if limit:
-                query = "SELECT id, quote, speaker, year, frame FROM quotes WHERE id >= ? ORDER BY id LIMIT ?"
-                cursor = conn.execute(query, (start_id, limit))
-            else:
-                query = "SELECT id, quote, speaker, year, frame FROM quotes WHERE id >= ? ORDER BY id"
-                cursor = conn.execute(query, (start_id,))
-                
-            all_quotes = cursor.fetchall()
+            cursor = self._select_quotes(conn, limit, start_id, only_missing)
+            
+            groups, total = self._group_quotes(cursor)
             
-            print(f"Generating Claude analyses for {len(all_quotes)} quotes...")
+            print(f"Generating Claude analyses for {total} quotes...")
             print(f"Using Claude-3.5-Sonnet for superior historical analysis")
-            print(f"Estimated cost: ${len(all_quotes) * 0.003:.2f} (much cheaper than OpenAI!)")
-            
-            for quote_id, quote, speaker, year, frame in all_quotes:
-                try:
-                    # Create prompt and get Claude analysis
-                    prompt = self.create_claude_prompt(quote, speaker, year, frame)
-                    analysis = self.get_claude_analysis(prompt)
-                    
-                    conn.execute("""
-                        UPDATE quotes 
-                        SET historian_analysis = ? 
-                        WHERE id = ?
-                    """, (analysis, quote_id))
-                    
-                    processed += 1
-                    
-                    if processed % 10 == 0:
-                        print(f"  Processed {processed} quotes...")
-                        conn.commit()
+            print(f"{len(groups)} distinct prompts after removing duplicates")
+            print(f"Estimated cost: ${len(groups) * 0.003:.2f} (much cheaper than OpenAI!)")
+            
+            pending, processed = self._pending_analyses(conn, groups, use_cache)
+            
+            # Several requests are in flight at once (paced by the rate limiter);
+            # results are written back from this thread only
+            executor = ThreadPoolExecutor(max_workers=CLAUDE_WORKERS)
+            try:
+                futures = {
+                    executor.submit(self._analyze_one, prompt): (key, quote_ids)
+                    for key, prompt, quote_ids in pending
+                }
+                
+                for n, future in enumerate(as_completed(futures), 1):
+                    key, quote_ids = futures[future]
+                    try:
+                        analysis, from_claude = future.result()
+                        
+                        # Only cache real Claude output so fallbacks get retried next run
+                        if from_claude:
+                            self._cache_analysis(conn, key, analysis)
+                        
+                        updates.extend((analysis, quote_id) for quote_id in quote_ids)
+                        processed += len(quote_ids)
                         
-                    # Rate limiting - Claude allows more requests than OpenAI
-                    time.sleep(0.5)  # Faster than OpenAI
+                        if n % 10 == 0:
+                            print(f"  Processed {processed} quotes...")
                         
-                except Exception as e:
-                    print(f"Error with quote {quote_id}: {e}")
-                    continue
+                        # Write back in large batches, one commit each
+                        if len(updates) >= COMMIT_EVERY:
+                            self._save_analyses(conn, updates)
+                            
+                    except Exception as e:
+                        print(f"Error with quote {quote_ids[0]}: {e}")
+                        continue
+            finally:
+                # Don't start queued requests if the loop above was interrupted
+                executor.shutdown(wait=True, cancel_futures=True)
             
-            conn.commit()
+            self._save_analyses(conn, updates)
             print(f"Completed: {processed} Claude analyses generated")
             
         except Exception as e:
@@ -283,6 +536,75 @@ Provide nuanced historical interpretation that illuminates the political and soc
             
         return processed
 
+    def regenerate_all_analyses_batch(self, limit=None, start_id=1, poll_interval=30, only_missing=False,
+                                      use_cache=True) -> int:
+        """Regenerate all analyses through the Message Batches API (half price, asynchronous)"""
+        
+        if not self.client:
+            return self.regenerate_all_analyses(limit=limit, start_id=start_id, only_missing=only_missing,
+                                                use_cache=use_cache)
+        
+        conn = sqlite3.connect(self.db_path)
+        processed = 0
+        
+        try:
+            # Get quotes to process
+            cursor = self._select_quotes(conn, limit, start_id, only_missing)
+            groups, total = self._group_quotes(cursor)
+            pending, processed = self._pending_analyses(conn, groups, use_cache)
+            
+            # Batch requests are keyed by prompt hash, so each answer fans out
+            # to every quote sharing that prompt
+            prompts = {key: (prompt, quote_ids) for key, prompt, quote_ids in pending}
+            keys = list(prompts)
+            
+            print(f"Submitting {len(keys)} distinct prompts ({total} quotes) to the Claude batch API...")
+            print(f"Estimated cost: ${len(keys) * 0.0015:.2f} (batch pricing)")
+            
+            for i in range(0, len(keys), BATCH_SIZE):
+                batch = self.client.messages.batches.create(requests=[
+                    {
+                        "custom_id": key.hex(),
+                        "params": {
+                            **CLAUDE_PARAMS,
+                            "system": SYSTEM_PROMPT,
+                            "messages": [{"role": "user", "content": prompts[key][0]}],
+                        },
+                    }
+                    for key in keys[i:i + BATCH_SIZE]
+                ])
+                print(f"  Batch {batch.id} submitted, waiting for results...")
+                
+                while batch.processing_status != "ended":
+                    time.sleep(poll_interval)
+                    batch = self.client.messages.batches.retrieve(batch.id)
+                
+                updates = []
+                for entry in self.client.messages.batches.results(batch.id):
+                    key = bytes.fromhex(entry.custom_id)
+                    prompt, quote_ids = prompts[key]
+                    if entry.result.type == "succeeded":
+                        analysis = entry.result.message.content[0].text.strip()
+                        self._cache_analysis(conn, key, analysis)
+                    else:
+                        # Errored or expired requests get the rule-based analysis
+                        analysis = self.generate_fallback_analysis(prompt)
+                    updates.extend((analysis, quote_id) for quote_id in quote_ids)
+                
+                processed += len(updates)
+                self._save_analyses(conn, updates)
+                print(f"  Processed {processed} quotes...")
+            
+            print(f"Completed: {processed} Claude analyses generated")
+            
+        except Exception as e:
+            print(f"Batch regeneration error: {e}")
+            
+        finally:
+            conn.close()
+            
+        return processed
+
 def test_claude_historian():
     """Test Claude historian with sample quotes"""
     
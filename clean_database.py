@@ -3,14 +3,22 @@
 
 import sqlite3
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def check_url_real(url):
-    """Check if URL returns real content (HTTP 200)"""
+def check_url_real(session, url):
+    """Check if URL returns real content: True on HTTP 200, False on a 404,
+    None when it couldn't be told (throttled, server errors, network trouble)"""
     try:
-        response = requests.head(url, timeout=10)
-        return response.status_code == 200
-    except:
+        response = session.head(url, timeout=10)
+    except requests.RequestException:
+        return None
+    if response.status_code == 200:
+        return True
+    if response.status_code == 404:
         return False
+    return None
 
 # Connect to database
 conn = sqlite3.connect("hansard_simple.db")
@@ -26,16 +34,33 @@ print("Checking which quotes have real Hansard URLs...\n")
 
 real_quotes = []
 fake_quotes = []
+unknown_quotes = []
 
-for quote_id, url, speaker, date in all_quotes:
-    if check_url_real(url):
+# One pooled session shared by all workers, retrying throttled or flaky responses
+session = requests.Session()
+retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retries)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+
+# The checks are pure network waits, so run them side by side
+with session, ThreadPoolExecutor(max_workers=32) as executor:
+    results = list(executor.map(lambda row: check_url_real(session, row[1]), all_quotes))
+
+for (quote_id, url, speaker, date), is_real in zip(all_quotes, results):
+    if is_real:
         real_quotes.append((quote_id, speaker, date))
         print(f"REAL: {speaker} ({date})")
+    elif is_real is None:
+        unknown_quotes.append((quote_id, speaker, date))
+        print(f"UNCHECKED: {speaker} ({date})")
     else:
         fake_quotes.append((quote_id, speaker, date))
         print(f"FAKE: {speaker} ({date})")
 
 print(f"\nFound {len(real_quotes)} real quotes, {len(fake_quotes)} fake quotes")
+if unknown_quotes:
+    print(f"Kept {len(unknown_quotes)} quotes whose URLs couldn't be checked - rerun to retry them")
 
 # Remove fake quotes
 if fake_quotes:
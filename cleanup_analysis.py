@@ -4,6 +4,22 @@
 import sqlite3
 import re
 
+# Historian preambles, removed in this order. Each one ends in a colon.
+PREAMBLE_RES = [
+    re.compile(r"Here's my historical analysis.*?follows:", re.IGNORECASE | re.DOTALL),
+    re.compile(r"As a historian.*?follows:", re.IGNORECASE | re.DOTALL),
+    re.compile(r"Here's my analysis.*?:", re.IGNORECASE | re.DOTALL),
+    re.compile(r"My analysis.*?:", re.IGNORECASE | re.DOTALL),
+    re.compile(r"This.*?analysis.*?:", re.IGNORECASE),
+]
+
+# Meta language left in the result: (literal start, pattern, replacement)
+META_RES = [
+    ("This parliamentary", re.compile(r"This parliamentary.*?reveals"), "Reveals"),
+    ("This intervention", re.compile(r"This intervention.*?demonstrates"), "Demonstrates"),
+    ("The speaker's", re.compile(r"The speaker's.*?reflects"), "Reflects"),
+]
+
 def clean_analysis(analysis_text):
     """Convert verbose Claude analysis to pithy 2-line description"""
     
@@ -12,26 +28,28 @@ def clean_analysis(analysis_text):
     
     # Remove historian preambles
     text = analysis_text
-    text = re.sub(r"Here's my historical analysis.*?follows:", "", text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"As a historian.*?follows:", "", text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"Here's my analysis.*?:", "", text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"My analysis.*?:", "", text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"This.*?analysis.*?:", "", text, flags=re.IGNORECASE)
+    if ':' in text:  # Every preamble pattern needs a colon
+        for pattern in PREAMBLE_RES:
+            text = pattern.sub("", text)
     
     # Clean up start of text
     text = text.strip()
     
-    # Split into sentences and take first two meaningful ones
-    sentences = text.split('. ')
-    
-    # Filter out very short or meta sentences
+    # Walk the '. '-separated sentences and take the first two meaningful
+    # ones, without splitting the rest of the text
     good_sentences = []
-    for sentence in sentences:
-        sentence = sentence.strip()
+    pos = 0
+    while len(good_sentences) < 2:
+        end = text.find('. ', pos)
+        sentence = (text[pos:] if end == -1 else text[pos:end]).strip()
+        
+        # Filter out very short or meta sentences
         if len(sentence) > 20 and not sentence.lower().startswith(('this', 'the analysis', 'my analysis')):
             good_sentences.append(sentence)
-        if len(good_sentences) >= 2:
+        
+        if end == -1:
             break
+        pos = end + 2
     
     if len(good_sentences) >= 2:
         result = good_sentences[0] + '. ' + good_sentences[1]
@@ -49,9 +67,9 @@ def clean_analysis(analysis_text):
             result += '.'
     
     # Remove any remaining meta language
-    result = re.sub(r"This parliamentary.*?reveals", "Reveals", result)
-    result = re.sub(r"This intervention.*?demonstrates", "Demonstrates", result)
-    result = re.sub(r"The speaker's.*?reflects", "Reflects", result)
+    for start, pattern, replacement in META_RES:
+        if start in result:
+            result = pattern.sub(replacement, result)
     
     return result.strip()
 
@@ -59,32 +77,38 @@ def cleanup_all_analyses():
     """Clean up all analyses in the database"""
     
     db = sqlite3.connect('database_updated.db')
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.execute('PRAGMA temp_store=MEMORY')
+    db.execute('PRAGMA cache_size=-65536')  # 64 MB page cache
     
     try:
-        # Get all analyses
-        cursor = db.execute("SELECT id, historian_analysis FROM quotes WHERE historian_analysis IS NOT NULL")
+        # Get all analyses long enough to need cleaning; the partial index
+        # keeps the short ones (already pithy) out of the scan
+        db.execute("CREATE INDEX IF NOT EXISTS idx_quotes_long_analysis ON quotes(id) WHERE length(historian_analysis) > 100")
+        cursor = db.execute("SELECT id, historian_analysis FROM quotes WHERE length(historian_analysis) > 100")
         rows = cursor.fetchall()
         
         print(f"Cleaning up {len(rows)} analyses...")
         
-        cleaned = 0
+        updates = []
         for quote_id, analysis in rows:
             if analysis and len(analysis) > 100:  # Only clean verbose ones
                 clean_analysis_text = clean_analysis(analysis)
                 
                 if clean_analysis_text and clean_analysis_text != analysis:
-                    db.execute("UPDATE quotes SET historian_analysis = ? WHERE id = ?", 
-                              (clean_analysis_text, quote_id))
-                    cleaned += 1
+                    updates.append((clean_analysis_text, quote_id))
                     
-                    if cleaned <= 5:  # Show first 5 examples
+                    if len(updates) <= 5:  # Show first 5 examples
                         print(f"\nQuote {quote_id}:")
                         print(f"BEFORE: {analysis[:100]}...")
                         print(f"AFTER:  {clean_analysis_text}")
                         print("-" * 50)
         
+        # One statement and one commit for every changed row
+        db.executemany("UPDATE quotes SET historian_analysis = ? WHERE id = ?", updates)
         db.commit()
-        print(f"\n✅ Cleaned up {cleaned} verbose analyses")
+        print(f"\n✅ Cleaned up {len(updates)} verbose analyses")
         print("Analyses are now pithy 2-line descriptions without historian language")
         
     except Exception as e:
@@ -3,6 +3,7 @@
 
 from hybrid_collector import HybridHansardCollector
 from enhanced_tagger import EnhancedTagger
+import sqlite3
 import time
 
 def main():
@@ -60,7 +61,6 @@ def main():
         tagger.close()
         
         # Check what we collected
-        import sqlite3
         conn = sqlite3.connect(db_path)
         result = conn.execute('SELECT COUNT(*) FROM quotes').fetchone()
         year_dist = conn.execute('SELECT year, COUNT(*) FROM quotes GROUP BY year ORDER BY year').fetchall()
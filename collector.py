@@ -1,8 +1,17 @@
 2# collector.py
 # Pulls Historic Hansard (no API key), extracts exact quotes about immigration x labour.
 
-import requests, re, json, csv, time
+import requests, re, json, csv, time, sqlite3, hashlib, random, threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import date, timedelta
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 BASE = "https://api.parliament.uk/historic-hansard"
 START = date(1890, 1, 1)      # Full historical range with fixed structure
@@ -12,29 +21,83 @@ END   = date(1950, 12, 31)
 MIG = r"(immigration|immigrant[s]?|migrant[s]?|alien[s]?|aliens|foreign(?:er|ers)?|guest\s*worker[s]?|colonial\s+(?:subjects|workers))"
 LAB = r"(labour\s*market|labor\s*market|wage[s]?|pay|employment|unemployment|job[s]?|workforce|manpower|strike[s]?|trade\s*union[s]?)"
 NEAR = 40  # words proximity window
+WORKERS = 8  # sitting days in flight at once; RATE_LIMIT paces them all together
+REQUEST_INTERVAL = 1.0  # seconds between requests across all workers
+REQUEST_JITTER = 0.5  # plus up to this much random extra
+DB_PATH = "hansard_raw.db"  # checkpoint of collected rows, so a rerun resumes
+CHECKPOINT_EVERY = 500  # rows per commit
+CHECKPOINT_DAYS = 31  # ...or days per commit, whichever fills first
+
+# One pooled session for every worker; the adapter retries throttled and
+# failing requests with exponential backoff, honouring Retry-After
+SESSION = requests.Session()
+SESSION.headers["User-Agent"] = "HansardResearch/1.0"
+retries = Retry(total=4, backoff_factor=1.0, status_forcelist=[429, 502, 503, 504],
+                raise_on_status=False)
+adapter = HTTPAdapter(pool_connections=WORKERS, pool_maxsize=WORKERS, max_retries=retries)
+SESSION.mount("https://", adapter)
+SESSION.mount("http://", adapter)
+
+class RateLimiter:
+    """Spaces calls so that all threads together make at most one per interval (plus jitter)"""
+    
+    def __init__(self, interval, jitter=0.0):
+        self.interval = interval
+        self.jitter = jitter
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval + random.uniform(0, self.jitter)
+        time.sleep(slot - now)
+
+RATE_LIMIT = RateLimiter(REQUEST_INTERVAL, REQUEST_JITTER)
 
 def fetch_json(url):
-    for attempt in range(4):
-        try:
-            r = requests.get(url, timeout=40, headers={"User-Agent":"HansardResearch/1.0"})
-            if r.status_code in (429, 502, 503, 504):
-                time.sleep(2 ** attempt); continue
-            r.raise_for_status()
-            return r.json()
-        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-            if attempt == 3:
-                raise
-            time.sleep(2 ** attempt)
-    r.raise_for_status()
-
-def words(text): 
-    return re.findall(r"\w[\w'-]*", text.lower())
+    RATE_LIMIT.wait()  # Shared by every worker, so the crawl stays at ~1 request/s
+    r = SESSION.get(url, timeout=40)
+    r.raise_for_status()  # Still failing after retries -> HTTPError
+    if orjson is not None:
+        return orjson.loads(r.content)  # Skips decoding the body to str first
+    return r.json()
+
+MIG_RE = re.compile(MIG)
+LAB_RE = re.compile(LAB)
+WORD_RE = re.compile(r"\w[\w'-]*")
+WS_RE = re.compile(r"\s+")
+
+@lru_cache(maxsize=None)
+def token_tags(token):
+    """1 if the token contains a MIG term, 2 for a LAB term, 3 for both"""
+    return (1 if MIG_RE.search(token) else 0) | (2 if LAB_RE.search(token) else 0)
 
 def proximity_hit(text):
-    w = words(text)
-    mi = [i for i,t in enumerate(w) if re.search(MIG, t)]
-    lj = [i for i,t in enumerate(w) if re.search(LAB, t)]
-    return any(abs(i-j) <= NEAR for i in mi for j in lj)
+    text = text.lower()
+    # A token can only match if the whole text does, so most speeches stop here
+    if not (MIG_RE.search(text) and LAB_RE.search(text)):
+        return False
+    # One pass over the words, remembering the latest MIG and LAB positions
+    last_mig = last_lab = -NEAR - 1
+    for i, token in enumerate(WORD_RE.findall(text)):
+        tags = token_tags(token)
+        if not tags:
+            continue
+        if tags & 1:
+            last_mig = i
+        if tags & 2:
+            last_lab = i
+        if i - last_lab <= NEAR and i - last_mig <= NEAR:
+            return True
+    return False
+
+def walk(nodes):
+    """Yield every node of a sitting's children tree, depth first in document order"""
+    for node in nodes:
+        yield node
+        yield from walk(node.get("children") or ())
 
 def iter_days(a, b):
     d = a
@@ -42,16 +105,32 @@ def iter_days(a, b):
         yield d
         d += timedelta(days=1)
 
-out = []
-for d in iter_days(START, END):
+def process_day(d):
+    """Fetch one sitting day and return its matching speeches as rows
+
+    Returns None if the day could not be fetched (throttled or failing even
+    after retries) or its body was not valid JSON, so that it is not
+    checkpointed as collected.
+    """
+    rows = []
     print(f"Processing {d.isoformat()}...")
     mon = d.strftime("%b").lower()
     day_url = f"{BASE}/sittings/{d.year}/{mon}/{d.day}.js"
     try:
         sitting = fetch_json(day_url)
-    except requests.HTTPError:
-        print(f"  No data for {d.isoformat()}")
-        continue
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            print(f"  No data for {d.isoformat()}")
+            return rows
+        print(f"  Fetch failed for {d.isoformat()}: {e}")
+        return None
+    except requests.RequestException as e:
+        print(f"  Fetch failed for {d.isoformat()}: {e}")
+        return None
+    except ValueError as e:
+        # orjson.JSONDecodeError is a ValueError, not a RequestException
+        print(f"  Unreadable response for {d.isoformat()}: {e}")
+        return None
 
     # Handle the actual API structure: list of house sittings
     if isinstance(sitting, list):
@@ -66,38 +145,106 @@ for d in iter_days(START, END):
                 continue
                 
             # Process speeches directly from the sitting data
-            stack = house_data.get('children', [])
             debate_title = house_data.get('title', '')
             
-            while stack:
-                node = stack.pop()
-                stack.extend(node.get("children", []))
-                text = node.get("text") or node.get("body") or ""
-                speaker = (node.get("speaker") or {}).get("name", "")
-                party = (node.get("speaker") or {}).get("party", "")
-                if not (text and speaker):
+            for node in walk(house_data.get('children') or ()):
+                get = node.get
+                member = get("speaker")
+                if not member:
+                    continue
+                speaker = member.get("name")
+                if not speaker:
                     continue
+                text = get("text") or get("body")
+                if not text:
+                    continue
+                party = member.get("party", "")
                 if proximity_hit(text):
-                    out.append({
+                    rows.append({
                         "date": d.isoformat(),
                         "house": house_name,
                         "debate_title": debate_title,
                         "member": speaker,
                         "party": party,
-                        "quote": re.sub(r"\s+", " ", text).strip(),
+                        "quote": WS_RE.sub(" ", text).strip(),
                         "hansard_url": f"https://api.parliament.uk/historic-hansard/sittings/{d.year}/{mon}/{d.day}"
                     })
-    time.sleep(0.2)  # be polite
+    return rows
+
+FIELDS = ["date","house","debate_title","member","party","quote","hansard_url"]
+
+def json_line(row):
+    if orjson is not None:
+        return orjson.dumps(row) + b"\n"
+    return (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+
+def dedup_key(row):
+    content = f"{row['date']}|{row['member']}|{row['quote']}"
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]
+
+conn = sqlite3.connect(DB_PATH)
+conn.execute("PRAGMA journal_mode=WAL")
+conn.execute("PRAGMA synchronous=NORMAL")
+conn.executescript("""
+    CREATE TABLE IF NOT EXISTS quotes (
+        id INTEGER PRIMARY KEY,
+        dedup_key TEXT UNIQUE,
+        date TEXT,
+        house TEXT,
+        debate_title TEXT,
+        member TEXT,
+        party TEXT,
+        quote TEXT,
+        hansard_url TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_quotes_date ON quotes(date);
+    CREATE TABLE IF NOT EXISTS collected_days (date TEXT PRIMARY KEY);
+""")
+
+# Days finished by an earlier, interrupted run are not fetched again
+done = {day for (day,) in conn.execute("SELECT date FROM collected_days")}
+days = [d for d in iter_days(START, END) if d.isoformat() not in done]
+print(f"{len(done)} days already collected, {len(days)} to go")
+
+batch, batch_days = [], []
+failed_days = []
+
+def checkpoint():
+    """Commit buffered rows together with the days they came from"""
+    conn.executemany(f"""
+        INSERT OR IGNORE INTO quotes (dedup_key, {", ".join(FIELDS)})
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, batch)
+    conn.executemany("INSERT OR IGNORE INTO collected_days (date) VALUES (?)", batch_days)
+    conn.commit()
+    batch.clear(); batch_days.clear()
 
-# write files
-with open("quotes.jsonl","w",encoding="utf-8") as f:
-    for r in out:
-        f.write(json.dumps(r, ensure_ascii=False) + "\n")
+# Days are fetched WORKERS at a time; map() hands results back in date order
+with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+    for d, rows in zip(days, executor.map(process_day, days)):
+        if rows is None:
+            failed_days.append(d)  # Left out of collected_days; refetched next run
+            continue
+        batch.extend((dedup_key(r), *(r[f] for f in FIELDS)) for r in rows)
+        batch_days.append((d.isoformat(),))
+        if len(batch) >= CHECKPOINT_EVERY or len(batch_days) >= CHECKPOINT_DAYS:
+            checkpoint()
+checkpoint()
+if failed_days:
+    print(f"{len(failed_days)} days could not be fetched and will be retried on the next run")
 
-with open("quotes.csv","w",newline="",encoding="utf-8") as f:
-    import csv
-    w = csv.DictWriter(f, fieldnames=list(out[0].keys()) if out else 
-        ["date","house","debate_title","member","party","quote","hansard_url"])
-    w.writeheader(); w.writerows(out)
+# Export everything collected so far, this run and earlier ones
+count = 0
+cursor = conn.execute(f"SELECT {', '.join(FIELDS)} FROM quotes ORDER BY date, id")
+with open("quotes.jsonl","wb") as jsonl_f, \
+     open("quotes.csv","w",newline="",encoding="utf-8") as csv_f:
+    w = csv.DictWriter(csv_f, fieldnames=FIELDS)
+    w.writeheader()
+    for values in cursor:
+        r = dict(zip(FIELDS, values))
+        jsonl_f.write(json_line(r))
+        w.writerow(r)
+        count += 1
+conn.close()
 
-print(f"Saved {len(out)} quotes -> quotes.jsonl & quotes.csv")
\ No newline at end of file
+print(f"Saved {count} quotes -> quotes.jsonl & quotes.csv ({DB_PATH})")
@@ -1,51 +1,89 @@
 # content_deep_dive.py
 # Deep exploration of section content structure
 
-import requests, json, re
+import json, re
+from hansard_http import make_session, fetch_json
 
 BASE = "https://api.parliament.uk/historic-hansard"
 
-def fetch_json(url):
-    r = requests.get(url, timeout=40, headers={"User-Agent":"HansardResearch/1.0"})
-    r.raise_for_status()
-    return r.json()
+# One keep-alive session for every request to api.parliament.uk
+SESSION = make_session()
+
+MIGRATION = r'alien|immigration|immigrant|foreign|migrant'
+LABOUR = r'labour|labor|employment|wage|job|work|strike|trade.*union'
+
+# Both vocabularies in one case-insensitive scan. The lookaheads don't consume
+# text, so a long labour hit ("trade ... union") can't hide a migration term
+CLASSIFY_RE = re.compile(rf'(?=(?P<mig>{MIGRATION}))|(?=(?P<lab>{LABOUR}))', re.IGNORECASE)
+
+# A field reads like prose if its opening TEXTY_SPAN characters contain any
+# of these (anywhere, not just as words); long blobs are never scanned in full
+TEXTY_RE = re.compile(r'the|and|of|to|in', re.IGNORECASE)
+TEXTY_SPAN = 200
+
+def classify(value):
+    """(has_migration, has_labour) for a text, stopping once both are found"""
+    has_mig = has_lab = False
+    for m in CLASSIFY_RE.finditer(value):
+        if m.lastgroup == 'mig':
+            has_mig = True
+        else:
+            has_lab = True
+        if has_mig and has_lab:
+            break
+    return has_mig, has_lab
 
 def explore_all_fields(obj, path="", max_depth=4, current_depth=0):
-    """Recursively explore all fields looking for text content"""
-    if current_depth > max_depth:
-        return []
-    
+    """Explore all fields looking for text content, depth first in document order"""
     found_texts = []
+    texty = TEXTY_RE.search
     
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            new_path = f"{path}.{key}" if path else key
-            
-            # Look for text-like fields
-            if isinstance(value, str) and len(value) > 50 and any(word in value.lower() for word in ['the', 'and', 'of', 'to', 'in']):
-                # This looks like speech text
-                found_texts.append({
-                    'path': new_path,
-                    'length': len(value),
-                    'text': value[:200] + "..." if len(value) > 200 else value,
-                    'has_migration': bool(re.search(r'alien|immigration|immigrant|foreign|migrant', value.lower())),
-                    'has_labour': bool(re.search(r'labour|labor|employment|wage|job|work|strike|trade.*union', value.lower()))
-                })
-            
-            elif isinstance(value, (dict, list)):
-                found_texts.extend(explore_all_fields(value, new_path, max_depth, current_depth + 1))
-    
-    elif isinstance(obj, list):
-        for i, item in enumerate(obj):
-            new_path = f"{path}[{i}]"
-            found_texts.extend(explore_all_fields(item, new_path, max_depth, current_depth + 1))
+    # Explicit stack instead of recursion. Entries are (obj, path, depth)
+    # nodes still to open or finished text records; each node's entries are
+    # pushed in reverse so they come back off in document order
+    stack = [(obj, path, current_depth)]
+    while stack:
+        entry = stack.pop()
+        if isinstance(entry, dict):
+            found_texts.append(entry)
+            continue
+        
+        obj, path, depth = entry
+        if depth > max_depth:
+            continue
+        
+        children = []
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                new_path = f"{path}.{key}" if path else key
+                
+                # Look for text-like fields
+                if isinstance(value, str) and len(value) > 50 and texty(value, 0, TEXTY_SPAN):
+                    # This looks like speech text
+                    has_migration, has_labour = classify(value)
+                    children.append({
+                        'path': new_path,
+                        'length': len(value),
+                        'text': value[:200] + "..." if len(value) > 200 else value,
+                        'has_migration': has_migration,
+                        'has_labour': has_labour
+                    })
+                
+                elif isinstance(value, (dict, list)):
+                    children.append((value, new_path, depth + 1))
+        
+        elif isinstance(obj, list):
+            for i, item in enumerate(obj):
+                children.append((item, f"{path}[{i}]", depth + 1))
+        
+        stack.extend(reversed(children))
     
     return found_texts
 
 print("=== DEEP CONTENT EXPLORATION ===")
 
 # Get the sitting data
-sitting = fetch_json(f"{BASE}/sittings/1905/may/12.js")
+sitting = fetch_json(SESSION, f"{BASE}/sittings/1905/may/12.js")
 commons = sitting[0]['house_of_commons_sitting']
 
 # Look for ALL text content in the entire structure
@@ -1,17 +1,18 @@
 # content_explorer.py
 # See what's actually in the 1905 debates
 
-import requests, re, json
+import re, json
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from datetime import date, timedelta
+from hansard_http import make_session, fetch_json, try_fetch_json
 
 BASE = "https://api.parliament.uk/historic-hansard"
 START = date(1905, 5, 12)  # Focus on one day we know has data
 END   = date(1905, 5, 12)
 
-def fetch_json(url):
-    r = requests.get(url, timeout=40, headers={"User-Agent":"HansardResearch/1.0"})
-    r.raise_for_status()
-    return r.json()
+# One keep-alive session for every request to api.parliament.uk
+SESSION = make_session()
 
 def iter_days(a, b):
     d = a
@@ -25,31 +26,39 @@ for d in iter_days(START, END):
     day_url = f"{BASE}/sittings/{d.year}/{mon}/{d.day}.js"
     
     try:
-        sitting = fetch_json(day_url)
+        sitting = fetch_json(SESSION, day_url)
         print(f"Sitting data structure: {type(sitting)}")
         
         items = sitting if isinstance(sitting, list) else sitting.get("items", [])
         print(f"Found {len(items)} items for this day")
         
-        for i, it in enumerate(items[:2]):  # Just check first 2 debates
+        debates = items[:2]  # Just check first 2 debates
+        
+        # Fetch the debates side by side, then report on them in order
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            fetched = list(executor.map(
+                lambda it: try_fetch_json(SESSION, f"{BASE}{it['href']}.js") if it.get("href") else (None, None),
+                debates))
+        
+        for i, (it, (deb, error)) in enumerate(zip(debates, fetched)):
             href = it.get("href")
             title = it.get("title", "No title")
             print(f"\nDEBATE {i+1}: {title}")
             print(f"URL: {href}")
             
             if href:
-                deb_url = f"{BASE}{href}.js"
                 try:
-                    deb = fetch_json(deb_url)
+                    if error:
+                        raise error
                     print(f"Debate has {len(deb.get('children', []))} child nodes")
                     
-                    # Sample the first few speeches
-                    stack = deb.get("children", [])[:3]  # Just first 3 for sampling
+                    # Sample the first few speeches, breadth first
+                    queue = deque(deb.get("children", [])[:3])  # Just first 3 for sampling
                     speech_count = 0
                     
-                    while stack and speech_count < 3:
-                        node = stack.pop(0)
-                        stack.extend(node.get("children", [])[:2])  # Limit expansion
+                    while queue and speech_count < 3:
+                        node = queue.popleft()
+                        queue.extend(node.get("children", [])[:2])  # Limit expansion
                         text = node.get("text") or node.get("body") or ""
                         speaker = (node.get("speaker") or {}).get("name", "")
                         
@@ -1,14 +1,15 @@
 # correct_approach.py
 # Try to find the correct way to get actual speech content
 
-import requests, json
+import json
+from concurrent.futures import ThreadPoolExecutor
+from hansard_http import make_session, fetch_json, try_fetch_json
 
 BASE = "https://api.parliament.uk/historic-hansard"
 
-def fetch_json(url):
-    r = requests.get(url, timeout=40, headers={"User-Agent":"HansardResearch/1.0"})
-    r.raise_for_status()
-    return r.json()
+# One keep-alive session for every request to api.parliament.uk; responses
+# are kept on disk for a day so re-runs of this script skip the network
+SESSION = make_session(expire_after=86400)
 
 print("=== FINDING THE CORRECT API APPROACH ===")
 
@@ -21,13 +22,18 @@ test_dates = [
     ("1895", "mar", "05"),  # Try earlier
 ]
 
-for year, month, day in test_dates:
+# Fetch every candidate sitting at once; they are still checked in order below
+with ThreadPoolExecutor(max_workers=len(test_dates)) as executor:
+    sittings = list(executor.map(
+        lambda url: try_fetch_json(SESSION, url), [f"{BASE}/sittings/{year}/{month}/{day}.js" for year, month, day in test_dates]))
+
+for (year, month, day), (sitting, error) in zip(test_dates, sittings):
     print(f"\n=== Testing {year}-{month}-{day} ===")
     
     # Try the sitting format
-    sitting_url = f"{BASE}/sittings/{year}/{month}/{day}.js"
     try:
-        sitting = fetch_json(sitting_url)
+        if error:
+            raise error
         print(f"Sitting data exists: {len(sitting)} items")
         
         # Check if this date has items with href
@@ -48,7 +54,7 @@ for year, month, day in test_dates:
                             # Try to fetch this content
                             content_url = f"{BASE}{first_item['href']}.js"
                             try:
-                                content = fetch_json(content_url)
+                                content = fetch_json(SESSION, content_url)
                                 print(f"  Content fetch SUCCESS! Keys: {list(content.keys())}")
                                 if 'children' in content and content['children']:
                                     child = content['children'][0]
@@ -72,8 +78,7 @@ html_url = "https://api.parliament.uk/historic-hansard/commons/1905/may/12"  # W
 print(f"HTML version might be at: {html_url}")
 
 try:
-    import requests
-    response = requests.get(html_url, headers={"User-Agent":"HansardResearch/1.0"})
+    response = SESSION.get(html_url)
     print(f"HTML response status: {response.status_code}")
     if response.status_code == 200:
         content = response.text
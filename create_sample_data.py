@@ -5,6 +5,8 @@ import sqlite3
 
 # Create sample database
 conn = sqlite3.connect("hansard_simple.db")
+conn.execute("PRAGMA journal_mode=WAL")
+conn.execute("PRAGMA synchronous=NORMAL")
 
 conn.execute("""
     CREATE TABLE IF NOT EXISTS quotes (
@@ -21,6 +23,12 @@ conn.execute("""
     )
 """)
 
+# simple_explorer.py filters on year and frame and lists their distinct values
+conn.executescript("""
+    CREATE INDEX IF NOT EXISTS idx_quotes_year ON quotes(year);
+    CREATE INDEX IF NOT EXISTS idx_quotes_frame ON quotes(frame);
+""")
+
 # Sample quotes including your perfect example
 sample_quotes = [
     {
@@ -70,21 +78,21 @@ sample_quotes = [
     }
 ]
 
-# Insert sample data
-for quote in sample_quotes:
-    try:
-        conn.execute("""
+# Insert sample data in one statement and one transaction
+rows = [
+    (q['year'], q['date'], q['speaker'], q['party'], q['frame'], q['quote'], q['url'])
+    for q in sample_quotes
+]
+try:
+    with conn:
+        conn.executemany("""
             INSERT OR IGNORE INTO quotes 
             (year, date, speaker, party, frame, quote, hansard_url)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            quote['year'], quote['date'], quote['speaker'], 
-            quote['party'], quote['frame'], quote['quote'], quote['url']
-        ))
-    except Exception as e:
-        print(f"Error inserting quote: {e}")
+        """, rows)
+except Exception as e:
+    print(f"Error inserting sample quotes: {e}")
 
-conn.commit()
 conn.close()
 
 print("Sample data created!")
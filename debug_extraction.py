@@ -3,8 +3,16 @@
 
 from updated_hybrid_collector import UpdatedHybridCollector
 from enhanced_quote_logic import EnhancedQuoteExtractor
-import requests
-from bs4 import BeautifulSoup
+from html_text import html_to_text
+from hansard_http import make_session
+import sqlite3
+
+# One keep-alive session for every request to api.parliament.uk; responses
+# are kept on disk for a day so re-runs of this script skip the network
+SESSION = make_session(expire_after=86400)
+
+# Built once; both debug functions share its compiled patterns
+EXTRACTOR = EnhancedQuoteExtractor()
 
 def debug_aliens_bill():
     """Debug extraction on the known Aliens Bill text"""
@@ -13,21 +21,17 @@ def debug_aliens_bill():
     # Fetch the actual Aliens Bill HTML
     url = "https://api.parliament.uk/historic-hansard/commons/1905/may/02/aliens-bill"
     
-    session = requests.Session()
-    session.headers.update({"User-Agent": "HansardResearch/1.0"})
-    
     try:
-        response = session.get(url, timeout=45)
+        response = SESSION.get(url, timeout=45)
         response.raise_for_status()
         
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        full_text = soup.get_text()
+        # Parse the raw bytes, skipping the decoded response.text copy
+        full_text = html_to_text(response.content)
         
         print(f"Full text length: {len(full_text)} characters")
         
         # Test with enhanced extractor
-        extractor = EnhancedQuoteExtractor()
+        extractor = EXTRACTOR
         
         # Step 1: Proximity test
         passes, mig_pos, lab_pos = extractor.precise_proximity_test(full_text)
@@ -41,18 +45,14 @@ def debug_aliens_bill():
             # Debug: Show actual terms found
             print("\n=== DEBUGGING TERM DETECTION ===")
             
-            # Test individual patterns
-            for i, pattern in enumerate(extractor.mig_compiled):
-                matches = pattern.findall(full_text.lower())
-                if matches:
-                    print(f"MIG pattern {i} ({pattern.pattern}): {len(matches)} matches")
-                    print(f"  Examples: {matches[:5]}")
-            
-            for i, pattern in enumerate(extractor.lab_compiled):
-                matches = pattern.findall(full_text.lower())
-                if matches:
-                    print(f"LAB pattern {i} ({pattern.pattern}): {len(matches)} matches")
-                    print(f"  Examples: {matches[:5]}")
+            # Test individual patterns against one lowercased copy of the text
+            full_text_lower = full_text.lower()
+            for label, patterns in (("MIG", extractor.mig_compiled), ("LAB", extractor.lab_compiled)):
+                for i, pattern in enumerate(patterns):
+                    matches = pattern.findall(full_text_lower)
+                    if matches:
+                        print(f"{label} pattern {i} ({pattern.pattern}): {len(matches)} matches")
+                        print(f"  Examples: {matches[:5]}")
             
             return
         
@@ -99,7 +99,6 @@ def compare_with_old_system():
     
     # Load old results
     try:
-        import sqlite3
         old_conn = sqlite3.connect("hansard_demo.db")
         old_quotes = old_conn.execute("""
             SELECT quote, LENGTH(quote) as char_length
@@ -110,9 +109,8 @@ def compare_with_old_system():
         print(f"Old system found: {len(old_quotes)} quotes")
         
         # Convert to word counts
-        extractor = EnhancedQuoteExtractor()
         for i, (quote, char_len) in enumerate(old_quotes):
-            word_count = extractor.count_words(quote)
+            word_count = EXTRACTOR.count_words(quote)
             print(f"  Quote {i+1}: {char_len} chars = {word_count} words")
             
             if word_count < 150:
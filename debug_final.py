@@ -1,34 +1,108 @@
 # debug_final.py
 # Debug the section fetching to see what content we're getting
 
-import requests, re
+from bisect import bisect_left
 from datetime import date
 from bs4 import BeautifulSoup
+from html_text import html_to_text
+from hansard_http import make_session
+from term_scanner import TermScanner, WORD_RE
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 
 BASE = "https://api.parliament.uk/historic-hansard"
 
+# One keep-alive session for every request to api.parliament.uk; responses
+# are kept on disk for a day so re-runs of this script skip the network
+SESSION = make_session(expire_after=86400)
+
 # Era-aware vocab
 MIG = r"(immigration|immigrant[s]?|migrant[s]?|alien[s]?|aliens|foreign(?:er|ers)?|guest\s*worker[s]?|colonial\s+(?:subjects|workers))"
 LAB = r"(labour\s*market|labor\s*market|wage[s]?|pay|employment|unemployment|job[s]?|workforce|manpower|strike[s]?|trade\s*union[s]?)"
 NEAR = 40
 
+# Matched case-insensitively, word by word; with pyahocorasick the automaton's
+# literals are derived from these same patterns
+SCANNER = TermScanner(MIG, LAB)
+MIG_RE, LAB_RE = SCANNER.mig_re, SCANNER.lab_re
+
 def fetch_html(url):
+    """Raw page bytes; both parsers take them as-is, so no decoded str copy is made"""
     try:
-        r = requests.get(url, timeout=30, headers={"User-Agent":"HansardResearch/1.0"})
+        r = SESSION.get(url, timeout=30)
         r.raise_for_status()
-        return r.text
+        return r.content
     except Exception as e:
         print(f"    Fetch error: {e}")
         return None
 
+def find_sections(html, needle):
+    """(title, href) of each section link whose title contains needle.
+
+    href comes from the enclosing <a>: '' if that has no href, None if
+    there is no <a> at all.
+    Uses selectolax's CSS engine when installed.
+    """
+    sections = []
+    if LexborHTMLParser is not None:
+        for span in LexborHTMLParser(html).css('span.section-link'):
+            text = span.text()
+            if needle in text.lower():
+                parent = span.parent
+                while parent is not None and parent.tag != 'a':
+                    parent = parent.parent
+                href = (parent.attributes.get('href') or '') if parent is not None else None
+                sections.append((text.strip(), href))
+        return sections
+    soup = BeautifulSoup(html, 'html.parser')
+    for span in soup.find_all('span', class_='section-link'):
+        text = span.get_text()
+        if needle in text.lower():
+            parent_a = span.find_parent('a')
+            sections.append((text.strip(), (parent_a.get('href') or '') if parent_a else None))
+    return sections
+
 def words(text): 
-    return re.findall(r"\w[\w'-]*", text.lower())
+    return WORD_RE.findall(text.lower())
+
+def closest_pair(mi, lj):
+    """(distance, i, j) for the closest MIG/LAB word pair, or None if either list is empty.
+
+    Both lists must be ascending, as SCANNER.term_positions returns them. Ties go to
+    the earliest i and then the earliest j, like a nested scan.
+    """
+    best = None
+    for i in mi:
+        k = bisect_left(lj, i)
+        # Only the neighbours either side of i can be nearest; the left one wins ties
+        for j in lj[max(k - 1, 0):k + 1]:
+            d = abs(i - j)
+            if best is None or d < best[0]:
+                best = (d, i, j)
+    return best
 
 def proximity_hit(text):
-    w = words(text)
-    mi = [i for i,t in enumerate(w) if re.search(MIG, t)]
-    lj = [i for i,t in enumerate(w) if re.search(LAB, t)]
-    return any(abs(i-j) <= NEAR for i in mi for j in lj)
+    text = text.lower()
+    # A word can only match if the whole text does, so most sections stop here
+    if not (MIG_RE.search(text) and LAB_RE.search(text)):
+        return False
+    # One pass over the words, remembering the latest MIG and LAB positions,
+    # that returns at the first pair within NEAR
+    last_mig = last_lab = -NEAR - 1
+    for i, m in enumerate(WORD_RE.finditer(text)):
+        tags = SCANNER.token_tags(m.group())
+        if not tags:
+            continue
+        if tags & 1:
+            last_mig = i
+        if tags & 2:
+            last_lab = i
+        if i - last_lab <= NEAR and i - last_mig <= NEAR:
+            return True
+    return False
 
 # Test with the first date we know has content
 d = date(1905, 5, 2)
@@ -44,28 +118,18 @@ if not sitting_html:
     print("Failed to fetch sitting HTML")
     exit()
 
-soup = BeautifulSoup(sitting_html, 'html.parser')
-section_links = soup.find_all('span', class_='section-link')
-
-# Find the specific aliens sections
-aliens_sections = []
-for link_span in section_links:
-    link_text = link_span.get_text().lower()
-    if 'alien' in link_text:
-        aliens_sections.append(link_span)
+aliens_sections = find_sections(sitting_html, 'alien')
 
 print(f"Found {len(aliens_sections)} aliens sections:")
-for i, section in enumerate(aliens_sections):
-    print(f"  {i+1}. {section.get_text().strip()}")
+for i, (title, _) in enumerate(aliens_sections):
+    print(f"  {i+1}. {title}")
 
 # Test fetching the first aliens section
 if aliens_sections:
-    test_section = aliens_sections[0]  # "Immigration of Aliens"
-    print(f"\n=== TESTING SECTION: {test_section.get_text().strip()} ===")
+    title, href = aliens_sections[0]  # "Immigration of Aliens"
+    print(f"\n=== TESTING SECTION: {title} ===")
     
-    parent_a = test_section.find_parent('a')
-    if parent_a:
-        href = parent_a.get('href')
+    if href is not None:
         print(f"Href: {href}")
         
         if href:
@@ -74,11 +138,10 @@ if aliens_sections:
             
             section_html = fetch_html(section_url)
             if section_html:
-                print(f"Section HTML length: {len(section_html)} chars")
+                print(f"Section HTML length: {len(section_html)} bytes")
                 
                 # Parse the content
-                soup = BeautifulSoup(section_html, 'html.parser')
-                section_text = soup.get_text()
+                section_text = html_to_text(section_html)
                 
                 print(f"Section text length: {len(section_text)} chars")
                 
@@ -90,8 +153,8 @@ if aliens_sections:
                     print("Content preview: [encoding issues]")
                 
                 # Test for terms
-                mig_matches = re.findall(MIG, section_text.lower())
-                lab_matches = re.findall(LAB, section_text.lower())
+                mig_matches = MIG_RE.findall(section_text)
+                lab_matches = LAB_RE.findall(section_text)
                 has_prox = proximity_hit(section_text)
                 
                 print(f"Migration matches ({len(mig_matches)}): {mig_matches[:5]}")
@@ -103,35 +166,23 @@ if aliens_sections:
                     w = words(section_text)
                     print(f"Total words: {len(w)}")
                     
-                    mi = [i for i,t in enumerate(w) if re.search(MIG, t)]
-                    lj = [i for i,t in enumerate(w) if re.search(LAB, t)]
+                    mi, lj = SCANNER.term_positions(section_text)
                     
                     print(f"Migration word positions: {mi[:5]}")
                     print(f"Labour word positions: {lj[:5]}")
                     
                     if mi and lj:
-                        min_dist = min(abs(i-j) for i in mi for j in lj)
+                        min_dist, i, j = closest_pair(mi, lj)
                         print(f"Minimum distance between terms: {min_dist} words")
                         if min_dist > NEAR:
                             print(f"Distance {min_dist} > threshold {NEAR}")
                             
                             # Show the closest pair
-                            best_pair = None
-                            for i in mi:
-                                for j in lj:
-                                    if abs(i-j) == min_dist:
-                                        best_pair = (i, j)
-                                        break
-                                if best_pair:
-                                    break
-                            
-                            if best_pair:
-                                i, j = best_pair
-                                start = max(0, min(i, j) - 10)
-                                end = min(len(w), max(i, j) + 10)
-                                context_words = w[start:end]
-                                context = ' '.join(context_words)
-                                print(f"Closest pair context: ...{context}...")
+                            start = max(0, min(i, j) - 10)
+                            end = min(len(w), max(i, j) + 10)
+                            context_words = w[start:end]
+                            context = ' '.join(context_words)
+                            print(f"Closest pair context: ...{context}...")
                 
             else:
                 print("Failed to fetch section content")
@@ -1,11 +1,19 @@
 # debug_json_response.py
 # Check what we're actually getting from the endpoint
+from hansard_http import make_session
 
-import requests
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# One keep-alive session for every request to api.parliament.uk; responses
+# are kept on disk for a day so re-runs of this script skip the network
+SESSION = make_session(expire_after=86400)
 
 def check_response(url):
     """Check what we get from URL"""
-    r = requests.get(url, timeout=30, headers={"User-Agent": "HansardResearch/1.0"})
+    r = SESSION.get(url, timeout=30)
     print(f"URL: {url}")
     print(f"Status: {r.status_code}")
     print(f"Content-Type: {r.headers.get('content-type', 'None')}")
@@ -14,7 +22,7 @@ def check_response(url):
     
     if r.headers.get('content-type', '').startswith('application/json'):
         try:
-            data = r.json()
+            data = orjson.loads(r.content) if orjson is not None else r.json()
             print(f"JSON parsed successfully")
             return data
         except Exception as e:
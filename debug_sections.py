@@ -1,9 +1,23 @@
 # debug_sections.py
 # Debug what sections are being extracted
 
-import requests, re
+import re
 from datetime import date
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from hansard_http import make_session, THROTTLE_RETRY
+from term_scanner import TermScanner
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+# BeautifulSoup builds its tree with lxml's C parser when that is installed
+BS4_PARSER = "lxml" if lxml is not None else "html.parser"
+
+# extract_debate_sections only reads div#content, the section spans and the
+# <li> around them, so the head, scripts and styles are never built into the tree
+SECTION_TAGS = SoupStrainer(["div", "li", "span"])
 
 BASE = "https://api.parliament.uk/historic-hansard"
 
@@ -12,23 +26,26 @@ MIG = r"(immigration|immigrant[s]?|migrant[s]?|alien[s]?|aliens|foreign(?:er|ers
 LAB = r"(labour\s*market|labor\s*market|wage[s]?|pay|employment|unemployment|job[s]?|workforce|manpower|strike[s]?|trade\s*union[s]?)"
 NEAR = 40
 
+# One pooled keep-alive session for every request; the adapter retries
+# throttled and failing requests with exponential backoff
+SESSION = make_session(pool_connections=16, pool_maxsize=32, max_retries=THROTTLE_RETRY)
+
+# Matched case-insensitively, word by word; with pyahocorasick the automaton's
+# literals are derived from these same patterns
+SCANNER = TermScanner(MIG, LAB)
+MIG_RE, LAB_RE = SCANNER.mig_re, SCANNER.lab_re
+
 def fetch_html(url):
-    r = requests.get(url, timeout=40, headers={"User-Agent":"HansardResearch/1.0"})
-    r.raise_for_status()
+    r = SESSION.get(url, timeout=40)
+    r.raise_for_status()  # Still failing after retries -> HTTPError
     return r.text
 
-def words(text): 
-    return re.findall(r"\w[\w'-]*", text.lower())
-
 def proximity_hit(text):
-    w = words(text)
-    mi = [i for i,t in enumerate(w) if re.search(MIG, t)]
-    lj = [i for i,t in enumerate(w) if re.search(LAB, t)]
-    return any(abs(i-j) <= NEAR for i in mi for j in lj)
+    return SCANNER.proximity_hit(text, NEAR)
 
 def extract_debate_sections(html_content, date_str, house):
     """Extract individual debate sections from HTML"""
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, BS4_PARSER, parse_only=SECTION_TAGS)
     sections = []
     
     # Get the main content
@@ -36,9 +53,10 @@ def extract_debate_sections(html_content, date_str, house):
     if not content_div:
         return sections
     
-    # Find section boundaries using the span structure
-    major_sections = soup.find_all('span', class_='major-section')
-    minor_sections = soup.find_all('span', class_='minor-section')
+    # Find section boundaries using the span structure, in one walk of the tree
+    section_spans = soup.find_all('span', class_=['major-section', 'minor-section'])
+    major_sections = [span for span in section_spans if 'major-section' in span['class']]
+    minor_sections = [span for span in section_spans if 'minor-section' in span['class']]
     all_sections = major_sections + minor_sections
     
     print(f"  Found {len(major_sections)} major + {len(minor_sections)} minor sections")
@@ -78,17 +96,17 @@ def extract_debate_sections(html_content, date_str, house):
                 print(f"      Preview: [encoding issues]")
             
             # Test for our terms
-            has_mig = bool(re.search(MIG, section_content.lower()))
-            has_lab = bool(re.search(LAB, section_content.lower()))
+            has_mig = bool(MIG_RE.search(section_content))
+            has_lab = bool(LAB_RE.search(section_content))
             has_prox = proximity_hit(section_content)
             
             print(f"      Migration: {has_mig}, Labour: {has_lab}, Proximity: {has_prox}")
             
             if has_mig:
-                mig_matches = re.findall(MIG, section_content.lower())
+                mig_matches = [m.lower() for m in MIG_RE.findall(section_content)]
                 print(f"        Migration matches: {mig_matches[:3]}")
             if has_lab:
-                lab_matches = re.findall(LAB, section_content.lower())
+                lab_matches = [m.lower() for m in LAB_RE.findall(section_content)]
                 print(f"        Labour matches: {lab_matches[:3]}")
         
         # Only include sections with substantial content
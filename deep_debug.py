@@ -6,6 +6,14 @@ import requests
 from bs4 import BeautifulSoup
 import re
 
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+# BeautifulSoup builds its tree with lxml's C parser when that is installed
+BS4_PARSER = "lxml" if lxml is not None else "html.parser"
+
 def deep_debug_extraction():
     """Step-by-step debugging of extraction process"""
     print("=== DEEP DEBUG: EXTRACTION STEP BY STEP ===")
@@ -18,7 +26,7 @@ def deep_debug_extraction():
     try:
         response = session.get(url, timeout=45)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.text, BS4_PARSER)
         full_text = soup.get_text()
         
         print(f"Full text: {len(full_text)} characters")
@@ -1,8 +1,10 @@
 # deep_diagnostic.py
 # Comprehensive diagnosis of why we're not finding matches
 
-import requests, re, json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
+from hansard_http import make_session, try_fetch_json, THROTTLE_RETRY
+from term_scanner import TermScanner
 
 BASE = "https://api.parliament.uk/historic-hansard"
 START = date(1905, 5, 12)  # Known Aliens Act date
@@ -12,20 +14,19 @@ END   = date(1905, 5, 12)
 MIG = r"(immigration|immigrant[s]?|migrant[s]?|alien[s]?|aliens|foreign(?:er|ers)?|guest\s*worker[s]?|colonial\s+(?:subjects|workers))"
 LAB = r"(labour\s*market|labor\s*market|wage[s]?|pay|employment|unemployment|job[s]?|workforce|manpower|strike[s]?|trade\s*union[s]?)"
 NEAR = 40
+WORKERS = 16  # days fetched at once
 
-def fetch_json(url):
-    r = requests.get(url, timeout=40, headers={"User-Agent":"HansardResearch/1.0"})
-    r.raise_for_status()
-    return r.json()
+# One pooled keep-alive session for every request; the adapter retries
+# throttled and failing requests with exponential backoff
+SESSION = make_session(pool_connections=16, pool_maxsize=32, max_retries=THROTTLE_RETRY)
 
-def words(text): 
-    return re.findall(r"\w[\w'-]*", text.lower())
+# Matched case-insensitively, word by word; with pyahocorasick the automaton's
+# literals are derived from these same patterns
+SCANNER = TermScanner(MIG, LAB)
+MIG_RE, LAB_RE = SCANNER.mig_re, SCANNER.lab_re
 
 def proximity_hit(text):
-    w = words(text)
-    mi = [i for i,t in enumerate(w) if re.search(MIG, t)]
-    lj = [i for i,t in enumerate(w) if re.search(LAB, t)]
-    return any(abs(i-j) <= NEAR for i in mi for j in lj)
+    return SCANNER.proximity_hit(text, NEAR)
 
 def iter_days(a, b):
     d = a
@@ -39,13 +40,18 @@ migration_speeches = 0
 labour_speeches = 0
 combined_speeches = 0
 
-for d in iter_days(START, END):
+# Fetch every sitting side by side; they are still reported day by day below
+days = list(iter_days(START, END))
+with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+    sittings = list(executor.map(
+        lambda url: try_fetch_json(SESSION, url), [f"{BASE}/sittings/{d.year}/{d.strftime('%b').lower()}/{d.day}.js" for d in days]))
+
+for d, (sitting, error) in zip(days, sittings):
     print(f"\n=== {d.isoformat()} ===")
-    mon = d.strftime("%b").lower()
-    day_url = f"{BASE}/sittings/{d.year}/{mon}/{d.day}.js"
     
     try:
-        sitting = fetch_json(day_url)
+        if error:
+            raise error
         print(f"Raw data type: {type(sitting)}")
         
         if isinstance(sitting, list):
@@ -85,8 +91,8 @@ for d in iter_days(START, END):
                         total_speeches += 1
                         
                         # Test individual patterns
-                        has_migration = bool(re.search(MIG, text.lower()))
-                        has_labour = bool(re.search(LAB, text.lower()))
+                        has_migration = bool(MIG_RE.search(text))
+                        has_labour = bool(LAB_RE.search(text))
                         has_proximity = proximity_hit(text)
                         
                         if has_migration:
@@ -107,10 +113,10 @@ for d in iter_days(START, END):
                             
                             # Show specific term matches
                             if has_migration:
-                                migration_matches = re.findall(MIG, text.lower())
+                                migration_matches = [m.lower() for m in MIG_RE.findall(text)]
                                 print(f"      Migration matches: {migration_matches}")
                             if has_labour:
-                                labour_matches = re.findall(LAB, text.lower())
+                                labour_matches = [m.lower() for m in LAB_RE.findall(text)]
                                 print(f"      Labour matches: {labour_matches}")
                 
                 print(f"  Total speeches in {house_name}: {house_speech_count}")
@@ -134,7 +140,7 @@ test_texts = [
 
 for i, text in enumerate(test_texts):
     print(f"Test {i+1}: '{text}'")
-    print(f"  Migration: {bool(re.search(MIG, text.lower()))}")
-    print(f"  Labour: {bool(re.search(LAB, text.lower()))}")
+    print(f"  Migration: {bool(MIG_RE.search(text))}")
+    print(f"  Labour: {bool(LAB_RE.search(text))}")
     print(f"  Proximity: {proximity_hit(text)}")
     print()
\ No newline at end of file
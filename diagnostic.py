@@ -2,7 +2,10 @@
 # Test why 1905 had 0 matches - expand search terms and proximity
 
 import requests, re, json, csv, time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
+from hansard_http import make_session, fetch_json, THROTTLE_RETRY
+from term_scanner import TermScanner
 
 BASE = "https://api.parliament.uk/historic-hansard"
 START = date(1905, 5, 10)
@@ -12,32 +15,26 @@ END   = date(1905, 5, 15)
 MIG = r"(immigration|immigrant[s]?|migrant[s]?|alien[s]?|aliens|foreign(?:er|ers)?|guest\s*worker[s]?|colonial\s+(?:subjects|workers)|pauper[s]?|undesirable[s]?)"
 LAB = r"(labour\s*market|labor\s*market|wage[s]?|pay|employment|unemployment|job[s]?|workforce|manpower|strike[s]?|trade\s*union[s]?|work|working|industry|industrial)"
 NEAR = 100  # Increased proximity window
+WORKERS = 16  # debates fetched at once
 
-def fetch_json(url):
-    for attempt in range(4):
-        try:
-            r = requests.get(url, timeout=40, headers={"User-Agent":"HansardResearch/1.0"})
-            if r.status_code in (429, 502, 503, 504):
-                time.sleep(2 ** attempt); continue
-            r.raise_for_status()
-            return r.json()
-        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-            if attempt == 3:
-                raise
-            time.sleep(2 ** attempt)
-    r.raise_for_status()
+# One pooled keep-alive session for every request; the adapter retries
+# throttled and failing requests with exponential backoff
+SESSION = make_session(pool_connections=16, pool_maxsize=32, max_retries=THROTTLE_RETRY)
 
-def words(text): 
-    return re.findall(r"\w[\w'-]*", text.lower())
+# Matched case-insensitively, word by word; with pyahocorasick the automaton's
+# literals are derived from these same patterns
+SCANNER = TermScanner(MIG, LAB)
+MIG_RE, LAB_RE = SCANNER.mig_re, SCANNER.lab_re
 
-def proximity_hit(text):
-    w = words(text)
-    mi = [i for i,t in enumerate(w) if re.search(MIG, t)]
-    lj = [i for i,t in enumerate(w) if re.search(LAB, t)]
-    return any(abs(i-j) <= NEAR for i in mi for j in lj)
+def fetch_debate(href):
+    """A debate's JSON, or None if the API has nothing for it"""
+    try:
+        return fetch_json(SESSION, f"{BASE}{href}.js")
+    except requests.HTTPError:
+        return None
 
-def single_term_hit(text, pattern):
-    return bool(re.search(pattern, text.lower()))
+def proximity_hit(text):
+    return SCANNER.proximity_hit(text, NEAR)
 
 def iter_days(a, b):
     d = a
@@ -53,21 +50,20 @@ for d in iter_days(START, END):
     mon = d.strftime("%b").lower()
     day_url = f"{BASE}/sittings/{d.year}/{mon}/{d.day}.js"
     try:
-        sitting = fetch_json(day_url)
+        sitting = fetch_json(SESSION, day_url)
     except requests.HTTPError:
         print(f"  No data for {d.isoformat()}")
         continue
 
     items = sitting if isinstance(sitting, list) else sitting.get("items", [])
-    for it in items:
-        href = it.get("href")
-        if not href: 
-            continue
-        deb_url = f"{BASE}{href}.js"
-
-        try:
-            deb = fetch_json(deb_url)
-        except requests.HTTPError:
+    hrefs = [it.get("href") for it in items if it.get("href")]
+    
+    # Fetch the day's debates side by side, then go through them in order
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        debates = list(executor.map(fetch_debate, hrefs))
+    
+    for href, deb in zip(hrefs, debates):
+        if deb is None:
             continue
 
         debate_title = deb.get("title", "")
@@ -84,8 +80,8 @@ for d in iter_days(START, END):
                 continue
             
             # Test different scenarios
-            has_migration = single_term_hit(text, MIG)
-            has_labour = single_term_hit(text, LAB)
+            has_migration = bool(MIG_RE.search(text))
+            has_labour = bool(LAB_RE.search(text))
             has_proximity = proximity_hit(text)
             
             if has_migration and has_labour and has_proximity:
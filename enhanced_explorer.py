@@ -5,6 +5,7 @@ import streamlit as st
 import sqlite3
 import pandas as pd
 import json
+from datetime import datetime
 from pathlib import Path
 
 st.set_page_config(
@@ -203,8 +204,6 @@ def main():
     with col3:
         # Date range selector
         if stats['earliest_date'] and stats['latest_date']:
-            from datetime import datetime
-            
             earliest = datetime.strptime(stats['earliest_date'], '%Y-%m-%d').date()
             latest = datetime.strptime(stats['latest_date'], '%Y-%m-%d').date()
             
@@ -384,6 +384,60 @@ class EvidenceBasedHistorian:
         finally:
             conn.close()
 
+    def analyze_quotes(self, quote_ids: List[int]) -> Dict[int, str]:
+        """Batch version of analyze_quote: one SELECT, one UPDATE transaction"""
+        
+        analyses = {}
+        if not quote_ids:
+            return analyses
+        
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        
+        try:
+            rows = []
+            # Stay well under SQLite's host-parameter limit
+            for start in range(0, len(quote_ids), 500):
+                chunk = quote_ids[start:start + 500]
+                placeholders = ",".join(["?"] * len(chunk))
+                rows.extend(conn.execute(f"""
+                    SELECT id, quote, speaker, year, frame, historian_analysis 
+                    FROM quotes 
+                    WHERE id IN ({placeholders})
+                """, chunk).fetchall())
+            
+            updates = []
+            for quote_id, quote, speaker, year, frame, cached in rows:
+                if cached:
+                    analyses[quote_id] = cached
+                    continue
+                
+                # Generate evidence-based analysis for truly missing rows only
+                analysis = self.generate_evidence_based_analysis(quote, speaker, year, frame)
+                analyses[quote_id] = analysis
+                updates.append((analysis, quote_id))
+            
+            if updates:
+                # Single transaction so the whole batch shares one fsync
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany("""
+                        UPDATE quotes 
+                        SET historian_analysis = ? 
+                        WHERE id = ?
+                    """, updates)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            
+        except Exception as e:
+            print(f"Error analyzing quotes {quote_ids[:5]}...: {e}")
+            
+        finally:
+            conn.close()
+        
+        return analyses
+
     def regenerate_all_analyses(self) -> int:
         """Regenerate all analyses with improved evidence-based approach"""
         
@@ -38,6 +38,10 @@ class EnhancedQuoteExtractor:
         self.mig_compiled = [re.compile(pattern, re.IGNORECASE) for pattern in self.mig_patterns]
         self.lab_compiled = [re.compile(pattern, re.IGNORECASE) for pattern in self.lab_patterns]
         
+        # One alternation per family, so each token is tested with a single search
+        self.mig_combined = re.compile('|'.join(self.mig_patterns), re.IGNORECASE)
+        self.lab_combined = re.compile('|'.join(self.lab_patterns), re.IGNORECASE)
+        
         # Text processing patterns
         self.sentence_splitter = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
         self.paragraph_splitter = re.compile(r'\n\s*\n')
@@ -60,13 +64,14 @@ class EnhancedQuoteExtractor:
     def find_term_positions(self, tokens: List[Tuple[str, int, int]], patterns: List[re.Pattern]) -> List[int]:
         """Find token positions where any pattern matches"""
         positions = []
+        seen = {}  # token -> matched, since debate text repeats most words
         for i, (token, start, end) in enumerate(tokens):
-            # Check if any pattern matches at this position in original text
-            text_fragment = token  # We already lowercased during tokenization
-            for pattern in patterns:
-                if pattern.search(token):  # Match on individual token
-                    positions.append(i)
-                    break
+            matched = seen.get(token)
+            if matched is None:
+                # Match on individual token (already lowercased during tokenization)
+                matched = seen[token] = any(pattern.search(token) for pattern in patterns)
+            if matched:
+                positions.append(i)
         return positions
 
     def precise_proximity_test(self, text: str, window_tokens: int = 40) -> Tuple[bool, List[int], List[int]]:
@@ -78,8 +83,8 @@ class EnhancedQuoteExtractor:
         tokens = self.tokenize_with_positions(text)
         
         # Find MIG and LAB term positions
-        mig_positions = self.find_term_positions(tokens, self.mig_compiled)
-        lab_positions = self.find_term_positions(tokens, self.lab_compiled)
+        mig_positions = self.find_term_positions(tokens, [self.mig_combined])
+        lab_positions = self.find_term_positions(tokens, [self.lab_combined])
         
         # Check if any MIG-LAB pair is within window
         passes = False
@@ -0,0 +1,59 @@
+# hansard_http.py
+# Shared keep-alive session setup for the Hansard debug scripts
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The debug scripts' on-disk response cache. It is kept apart from the
+# collectors' hansard_http_cache, whose entries never expire
+DEBUG_CACHE = "hansard_debug_cache"
+
+# Retries throttled and failing requests with exponential backoff, honouring
+# Retry-After; once retries run out the last response is returned as-is
+THROTTLE_RETRY = Retry(total=4, backoff_factor=1.0, status_forcelist=[429, 502, 503, 504],
+                       raise_on_status=False)
+
+def make_session(expire_after=None, pool_connections=10, pool_maxsize=20, max_retries=0):
+    """One keep-alive session for every request to api.parliament.uk.
+
+    With expire_after (seconds) and requests_cache installed, GET responses
+    are kept in DEBUG_CACHE for that long, so re-runs skip the network;
+    otherwise it is a plain requests.Session. max_retries is handed to the
+    HTTPAdapter as-is (a count or a urllib3 Retry).
+    """
+    if expire_after is not None and requests_cache is not None:
+        session = requests_cache.CachedSession(DEBUG_CACHE, backend="sqlite", expire_after=expire_after)
+    else:
+        session = requests.Session()
+    session.headers.update({"User-Agent": "HansardResearch/1.0"})
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                          max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def fetch_json(session, url, timeout=40):
+    """A URL's parsed JSON; an error status (after any retries) raises HTTPError"""
+    r = session.get(url, timeout=timeout)
+    r.raise_for_status()
+    if orjson is not None:
+        return orjson.loads(r.content)  # Skips decoding the body to str first
+    return r.json()
+
+def try_fetch_json(session, url, timeout=40):
+    """fetch_json for worker threads: returns (data, None) or (None, error)"""
+    try:
+        return fetch_json(session, url, timeout), None
+    except Exception as e:
+        return None, e
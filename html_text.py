@@ -0,0 +1,17 @@
+# html_text.py
+# Visible text of Hansard HTML pages, shared by the collectors and debug scripts
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+def html_to_text(html):
+    """Visible text of an HTML page (str or raw bytes), parsed with selectolax when installed"""
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        tree.strip_tags(['script', 'style'])  # get_text() skips these too
+        return tree.text()
+    return BeautifulSoup(html, 'html.parser').get_text()
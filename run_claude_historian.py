@@ -1,7 +1,8 @@
 # run_claude_historian.py
 # Simple script to run Claude historian with your API key
 
-from claude_historian import ClaudeHistorian
+import sqlite3
+from claude_historian import ClaudeHistorian, HISTORIAN_INSTRUCTIONS
 
 def run_claude_test(api_key):
     """Test Claude with 3 quotes first"""
@@ -17,7 +18,6 @@ def run_claude_test(api_key):
         print(f"✅ Success! Processed {processed} quotes")
         
         # Show results
-        import sqlite3
         db = sqlite3.connect("database_updated.db")
         examples = db.execute("SELECT id, quote, historian_analysis FROM quotes WHERE id <= 3").fetchall()
         
@@ -68,6 +68,8 @@ def show_sample_prompt():
     prompt = historian.create_claude_prompt(sample_quote, "Sir Kenelm Digby", 1905, "LABOUR_THREAT")
     
     print("=== SAMPLE CLAUDE PROMPT ===")
+    print(HISTORIAN_INSTRUCTIONS)
+    print()
     print(prompt)
     print("\n" + "="*50)
 
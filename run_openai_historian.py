@@ -1,6 +1,7 @@
 # run_openai_historian.py
 # Simple script to run OpenAI historian with your API key
 
+import sqlite3
 from openai_historian import OpenAIHistorian
 
 def run_test_analysis(api_key):
@@ -17,7 +18,6 @@ def run_test_analysis(api_key):
         print(f"✅ Success! Processed {processed} quotes")
         
         # Show results
-        import sqlite3
         db = sqlite3.connect("database_updated.db")
         examples = db.execute("SELECT id, quote, historian_analysis FROM quotes WHERE id <= 3").fetchall()
         
@@ -1,6 +1,7 @@
 # run_robust_1925_1930.py
 # Use the final_robust_collector for 1925-1930
 
+import sqlite3
 from final_robust_collector import RobustHansardCollector
 
 def main():
@@ -19,7 +20,6 @@ def main():
         print("\n✅ Robust collection completed!")
         
         # Check results
-        import sqlite3
         conn = sqlite3.connect("hansard_1925_1930_robust.db")
         result = conn.execute('SELECT COUNT(*) FROM quotes').fetchone()
         year_dist = conn.execute('SELECT year, COUNT(*) FROM quotes GROUP BY year ORDER BY year').fetchall()
@@ -0,0 +1,139 @@
+# term_scanner.py
+# Word-level MIG/LAB vocabulary scanner shared by the diagnostic scripts
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import product
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+WORD_RE = re.compile(r"\w[\w'-]*")
+LITERAL_RE = re.compile(r"\w+")
+
+def _expand(parsed):
+    """Every string the parsed pattern can match inside one word.
+
+    Words have no whitespace, so whitespace classes only ever match empty:
+    "guest\\s*worker" yields "guestworker" and "colonial\\s+subjects" nothing.
+    """
+    strings = {""}
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            options = {chr(av).lower()}
+        elif op is sre_parse.IN:
+            options = set()
+            for item_op, item in av:
+                if item_op is sre_parse.LITERAL:
+                    options.add(chr(item).lower())
+                elif item_op is sre_parse.RANGE and item[1] - item[0] < 64:
+                    options.update(chr(c).lower() for c in range(item[0], item[1] + 1))
+                elif not (item_op is sre_parse.CATEGORY and item is sre_parse.CATEGORY_SPACE):
+                    raise ValueError(f"can't expand character set item {item_op} {item}")
+        elif op is sre_parse.SUBPATTERN:
+            options = _expand(av[-1])
+        elif op is sre_parse.BRANCH:
+            options = set().union(*(_expand(p) for p in av[1]))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            lo, hi, sub = av
+            sub = _expand(sub)
+            if sub <= {""}:
+                options = {""} if lo == 0 or sub else set()
+            elif hi is sre_parse.MAXREPEAT:
+                raise ValueError("can't expand an unbounded repeat of word characters")
+            else:
+                options = {"".join(p) for n in range(lo, hi + 1) for p in product(sub, repeat=n)}
+        else:
+            raise ValueError(f"can't expand {op}")
+        strings = {s + o for s, o in product(strings, options)}
+    return strings
+
+def word_literals(pattern):
+    """The lowercase literals a word must contain for pattern to match inside it.
+
+    Derived from the pattern itself, and only the shortest are kept: "migrant"
+    already covers "immigrant" and "migrants".
+    """
+    found = {s for s in _expand(sre_parse.parse(pattern)) if s}
+    for s in found:
+        if not LITERAL_RE.fullmatch(s):
+            raise ValueError(f"{s!r} from {pattern!r} is not made of word characters")
+    literals = []
+    for s in sorted(found, key=len):
+        if not any(t in s for t in literals):
+            literals.append(s)
+    return literals
+
+def pairs_within(mi, lj, near):
+    """True if some i in mi and j in lj are at most near apart; both lists ascending"""
+    a = b = 0
+    while a < len(mi) and b < len(lj):
+        d = mi[a] - lj[b]
+        if abs(d) <= near:
+            return True
+        # Step past whichever position is further behind
+        if d < 0:
+            a += 1
+        else:
+            b += 1
+    return False
+
+class TermScanner:
+    """Finds which words of a text contain a MIG or a LAB vocabulary match"""
+
+    def __init__(self, mig, lab):
+        # Compiled once and case-insensitive, so text is matched without lowercased copies
+        self.mig_re = re.compile(mig, re.IGNORECASE)
+        self.lab_re = re.compile(lab, re.IGNORECASE)
+        # Each distinct word is matched against the vocab once, not once per occurrence
+        self.token_tags = lru_cache(maxsize=None)(self._token_tags)
+
+        # With pyahocorasick, every term in a text is found in one pass over it
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for tag, pattern in ((1, mig), (2, lab)):
+                for term in word_literals(pattern):
+                    self.automaton.add_word(term, (tag, len(term)))
+            self.automaton.make_automaton()
+        else:
+            self.automaton = None
+
+    def _token_tags(self, token):
+        """1 if the word contains a MIG term, 2 for a LAB term, 3 for both"""
+        return (1 if self.mig_re.search(token) else 0) | (2 if self.lab_re.search(token) else 0)
+
+    def term_positions(self, text):
+        """Indices (into WORD_RE.findall(text)) of the MIG and LAB words, from a single pass"""
+        mi, lj = [], []
+
+        if self.automaton is not None:
+            # The terms are word characters, so each hit lies inside exactly one word
+            text = text.lower()
+            starts = [m.start() for m in WORD_RE.finditer(text)]
+            for end, (tag, length) in self.automaton.iter(text):
+                i = bisect_right(starts, end - length + 1) - 1
+                positions = mi if tag == 1 else lj
+                if not positions or positions[-1] != i:
+                    positions.append(i)
+            return mi, lj
+
+        for i, t in enumerate(WORD_RE.findall(text)):
+            tags = self.token_tags(t)
+            if tags & 1:
+                mi.append(i)
+            if tags & 2:
+                lj.append(i)
+        return mi, lj
+
+    def proximity_hit(self, text, near):
+        """True if a MIG word and a LAB word are at most near words apart"""
+        mi, lj = self.term_positions(text)
+        return pairs_within(mi, lj, near)